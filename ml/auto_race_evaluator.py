@@ -1,6 +1,7 @@
 import pandas as pd
 import os
-import glob
+import fnmatch
+import re
 import shutil
 from datetime import datetime, timedelta
 import time
@@ -20,6 +21,10 @@ class AutoRaceEvaluator:
     
     def __init__(self, config_path="config/auto_evaluator_config.json"):
         self.config = self.load_config(config_path)
+        # All file patterns compiled once into a single regex (one match per file per scan)
+        self.file_pattern_re = re.compile(
+            '|'.join(fnmatch.translate(p) for p in self.config["file_patterns"]) or r'(?!)'
+        )
         self.setup_logging()
         self.processed_races = self.load_processed_races()
         
@@ -118,18 +123,20 @@ class AutoRaceEvaluator:
             return []
         
         new_files = []
-        patterns = self.config["file_patterns"]
         min_age = self.config["min_file_age_seconds"]
-        
-        for pattern in patterns:
-            files = glob.glob(os.path.join(watch_dir, pattern))
-            for file_path in files:
+        now = time.time()
+        
+        with os.scandir(watch_dir) as it:
+            for entry in it:
+                # Like glob: '*' does not match hidden files
+                if entry.name.startswith('.') or not self.file_pattern_re.match(entry.name):
+                    continue
+                if not entry.is_file() or entry.name in self.processed_races:
+                    continue
                 # Check if file is old enough (to ensure it's fully written)
-                file_age = time.time() - os.path.getmtime(file_path)
+                file_age = now - entry.stat().st_mtime
                 if file_age >= min_age:
-                    file_name = os.path.basename(file_path)
-                    if file_name not in self.processed_races:
-                        new_files.append(file_path)
+                    new_files.append(entry.path)
         
         return new_files
     
@@ -287,6 +294,23 @@ class AutoRaceEvaluator:
         Update the master simulation log with new race data
         """
         master_log_file = self.config["master_log_file"]
+        key_cols = ['Race_Name', 'Driver']
+        
+        new_data = pd.DataFrame(new_simulation_data).drop_duplicates(subset=key_cols, keep='last')
+        
+        # Fast path: same columns and no (race, driver) overlap -> append rows
+        # in place instead of parsing and rewriting the whole log
+        if os.path.exists(master_log_file):
+            header = pd.read_csv(master_log_file, nrows=0).columns
+            if set(header) == set(new_data.columns):
+                existing_keys = pd.read_csv(master_log_file, usecols=key_cols, dtype=str)
+                overlap = pd.MultiIndex.from_frame(existing_keys).isin(
+                    pd.MultiIndex.from_frame(new_data[key_cols].astype(str))
+                )
+                if not overlap.any():
+                    new_data[list(header)].to_csv(master_log_file, mode='a', header=False, index=False)
+                    self.logger.info(f"Updated master log with {len(new_data)} new entries")
+                    return
         
         # Load existing log or create new one
         if os.path.exists(master_log_file):
@@ -295,7 +319,6 @@ class AutoRaceEvaluator:
             existing_log = pd.DataFrame()
         
         # Append new data
-        new_data = pd.DataFrame(new_simulation_data)
         updated_log = pd.concat([existing_log, new_data], ignore_index=True)
         
         # Remove duplicates (in case of reprocessing)
@@ -2,9 +2,25 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 from datetime import datetime
 import seaborn as sns
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.csv_cache import read_csv_cached
+
+# Repeated string keys are read as categoricals so merges and groupbys run on int codes
+CATEGORY_COLUMNS = ('Driver', 'Race_Name', 'Outcome')
+
+def read_csv(path):
+    """
+    Cached CSV read (utils/csv_cache) with the repeated key columns as categoricals.
+    Returns a copy so callers may modify the frame freely
+    """
+    df = read_csv_cached(path)
+    return df.astype({col: 'category' for col in CATEGORY_COLUMNS if col in df.columns})
+
 class F1BetSimulator:
     """
     F1 Betting Simulator that tracks profit/loss over time
@@ -21,7 +37,7 @@ class F1BetSimulator:
         Expected columns: Driver, Quote, Predicted_Probability, EV, Race_Name
         """
         try:
-            self.betting_df = pd.read_csv(csv_path)
+            self.betting_df = read_csv(csv_path)
             print(f"✅ Loaded {len(self.betting_df)} betting recommendations")
             return True
         except Exception as e:
@@ -34,7 +50,7 @@ class F1BetSimulator:
         Expected columns: Driver, Actual_Position, Race_Name
         """
         try:
-            self.results_df = pd.read_csv(csv_path)
+            self.results_df = read_csv(csv_path)
             print(f"✅ Loaded results for {len(self.results_df)} drivers")
             return True
         except Exception as e:
@@ -1,10 +1,11 @@
 import pandas as pd
 import joblib
+from sklearn.inspection import permutation_importance
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 # Lade das Modell
-model = joblib.load("models/rf_model.pkl")
+model = joblib.load("models/rf_model.pkl")  # komprimiert gespeichert -> kein mmap
 
 # Lade das Trainings-Feature-Set
 df = pd.read_csv("data/processed/driver_feature_data.csv")
@@ -21,7 +22,13 @@ X = df[[
 
 
 # Extrahiere Feature-Importances
-importances = model.feature_importances_
+if hasattr(model, "feature_importances_"):
+    importances = model.feature_importances_
+else:
+    # HistGradientBoosting hat kein feature_importances_ -> Permutation auf den Trainingsdaten
+    importances = permutation_importance(
+        model, X, df["final_position"].astype(int), n_repeats=5, random_state=42, n_jobs=-1
+    ).importances_mean
 features = X.columns
 print(f"Features: {len(features)}, Importances: {len(importances)}")
 importance_df = pd.DataFrame({"feature": features, "importance": importances})
@@ -30,7 +37,7 @@ importance_df = importance_df.sort_values(by="importance", ascending=False)
 # 📊 Plotten
 plt.figure(figsize=(10, 6))
 sns.barplot(x="importance", y="feature", data=importance_df, palette="Blues_d")
-plt.title("Feature Importance – Random Forest")
+plt.title(f"Feature Importance – {type(model).__name__}")
 plt.tight_layout()
 plt.savefig("data/processed/feature_importance_plot.png")
 plt.show()
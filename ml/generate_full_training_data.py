@@ -1,16 +1,20 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
 import fastf1
-from fastf1.core import Laps
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 from utils.feature_engineering import (
-    get_track_affinity,
-    get_team_strength,
-    estimate_momentum
+    track_affinity_batch,
+    team_strength_batch,
+    momentum_batch,
+    aggregate_lap_features
 )
+from utils.session_cache import load_race
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 fastf1.Cache.enable_cache("cache")
 
 # 📅 Konfiguration
@@ -37,78 +41,62 @@ HOME_TRACKS = {
     "PIA": "Australia",
     "MAG": "Denmark"
 }
+# Als Series für vektorisierte Lookups (Ländernamen als category)
+HOME_TRACKS_S = pd.Series(HOME_TRACKS, dtype="category")
 
-all_rows = []
-
-for year in YEARS:
-    schedule = fastf1.get_event_schedule(year, include_testing=False)
 
-    for _, row in schedule.iterrows():
-        race_name = row["EventName"]
-        try:
-            session = fastf1.get_session(year, race_name, SESSION_TYPE)
-            session.load()
-            laps = session.laps.pick_quicklaps()
-            if laps.empty:
-                continue
+def main():
+    all_races = []
 
-            weather = session.weather_data
-            results = session.results
+    for year in YEARS:
+        schedule = fastf1.get_event_schedule(year, include_testing=False)
 
-            for drv in laps["Driver"].unique():
-                d_laps = laps[laps["Driver"] == drv]
-                if d_laps.empty:
+        for _, row in schedule.iterrows():
+            race_name = row["EventName"]
+            try:
+                laps, weather, results = load_race(year, race_name, SESSION_TYPE)
+                if laps.empty:
                     continue
 
+                results_by_abbr = results.set_index("Abbreviation")
+
+                # Wettermittelwerte (einmal pro Rennen)
                 try:
-                    fastest = d_laps["LapTime"].min().total_seconds()
-                    avg = d_laps["LapTime"].mean().total_seconds()
-                    pitstops = d_laps["PitOutTime"].count()
-                    team = d_laps["Team"].iloc[0]
-                    track = session.event["EventName"]
-
-                    # Startplatz ermitteln
-                    try:
-                        start_position = results[results["Abbreviation"] == drv]["GridPosition"].values[0]
-                    except:
-                        start_position = None
-
-                    # Wettermittelwerte
-                    try:
-                        air_temp = weather["AirTemp"].mean()
-                        humidity = weather["Humidity"].mean()
-                        rain = weather["Rainfall"].mean()
-                    except:
-                        air_temp, humidity, rain = None, None, None
-
-                    all_rows.append({
-                        "year": year,
-                        "race": race_name,
-                        "driver": drv,
-                        "team": team,
-                        "fastest_lap": fastest,
-                        "avg_lap": avg,
-                        "pitstops": pitstops,
-                        "track_affinity": get_track_affinity(race_name, drv),
-                        "team_strength": get_team_strength(team),
-                        "momentum": estimate_momentum(drv),
-                        "start_position": start_position,
-                        "air_temp": air_temp,
-                        "humidity": humidity,
-                        "rain": rain,
-                        "home_race": 1 if HOME_TRACKS.get(drv, "") == race_name else 0,
-                        "position": results[results["Abbreviation"] == drv]["Position"].values[0] if drv in results["Abbreviation"].values else None
-                    })
-
-                except Exception as e:
-                    print(f"⚠️ Fehler bei Fahrer {drv} in {race_name} {year}: {e}")
-        except Exception as e:
-            print(f"⚠️ Fehler beim Laden von {race_name} {year}: {e}")
-
-# 📝 Speichern
-df = pd.DataFrame(all_rows)
-os.makedirs("data/full/", exist_ok=True)
-df.to_csv("data/full/full_training_data.csv", index=False)
-
-print(f"\n✅ Datengenerierung abgeschlossen mit {len(df)} Einträgen.")
-print(df.head())
+                    weather_means = weather[["AirTemp", "Humidity", "Rainfall"]].mean().to_dict()
+                except (KeyError, AttributeError):
+                    weather_means = {"AirTemp": None, "Humidity": None, "Rainfall": None}
+
+                # Alle Fahrer-Kennzahlen in einem groupby-Durchlauf
+                agg = aggregate_lap_features(laps)[["team", "fastest_lap", "avg_lap", "pitstops"]]
+                agg["track_affinity"] = track_affinity_batch(race_name, agg.index)
+                agg["team_strength"] = team_strength_batch(agg["team"])
+                agg["momentum"] = momentum_batch(agg.index)
+
+                # Startplatz und Endposition ermitteln
+                grid = results_by_abbr[["GridPosition", "Position"]].reindex(agg.index)
+                agg["start_position"] = grid["GridPosition"]
+                agg["air_temp"] = weather_means["AirTemp"]
+                agg["humidity"] = weather_means["Humidity"]
+                agg["rain"] = weather_means["Rainfall"]
+                agg["home_race"] = HOME_TRACKS_S.reindex(agg.index).eq(race_name).to_numpy(dtype=np.int8)
+                agg["position"] = grid["Position"]
+
+                race_df = agg.reset_index().rename(columns={"Driver": "driver"})
+                race_df.insert(0, "year", year)
+                race_df.insert(1, "race", race_name)
+                all_races.append(race_df.astype({"year": "int16", "pitstops": "int16", "home_race": "int8"}))
+
+            except Exception as e:
+                print(f"⚠️ Fehler beim Laden von {race_name} {year}: {e}")
+
+    # 📝 Speichern
+    df = pd.concat(all_races, ignore_index=True) if all_races else pd.DataFrame()
+    os.makedirs("data/full/", exist_ok=True)
+    df.to_csv("data/full/full_training_data.csv", index=False)
+
+    print(f"\n✅ Datengenerierung abgeschlossen mit {len(df)} Einträgen.")
+    print(df.head())
+
+
+if __name__ == "__main__":
+    main()
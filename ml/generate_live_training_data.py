@@ -1,17 +1,20 @@
 import os
 import sys
-import pandas as pd
 import fastf1
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Fix für utils
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
 from utils.feature_engineering import (
-    get_track_affinity,
-    get_team_strength,
-    estimate_momentum
+    track_affinity_batch,
+    team_strength_batch,
+    momentum_batch,
+    aggregate_lap_features
 )
+from utils.session_cache import load_race
 
-# Fix für utils
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 fastf1.Cache.enable_cache("cache")
 
 # Konfiguration
@@ -20,45 +23,18 @@ RACE = "Canada"
 SESSION = "R"
 
 # Session laden
-session = fastf1.get_session(YEAR, RACE, SESSION)
-session.load()
-laps = session.laps.pick_quicklaps()
-drivers = laps["Driver"].unique()
-
-features = []
-
-for drv in drivers:
-    d_laps = laps[laps["Driver"] == drv]
-    if d_laps.empty:
-        continue
-
-    try:
-        fastest_lap = d_laps["LapTime"].min().total_seconds()
-        avg_lap = d_laps["LapTime"].mean().total_seconds()
-        stints = d_laps["Stint"].nunique()
-        pitstops = d_laps["PitOutTime"].count()
-        laps_completed = d_laps["LapNumber"].max()
-        team = d_laps["Team"].iloc[0]
-
-        features.append({
-            "year": YEAR,
-            "race": RACE,
-            "driver": drv,
-            "fastest_lap": fastest_lap,
-            "avg_lap": avg_lap,
-            "stints": stints,
-            "pitstops": pitstops,
-            "laps_completed": laps_completed,
-            "track_affinity": get_track_affinity(RACE, drv),
-            "team_strength": get_team_strength(team),
-            "momentum": estimate_momentum(drv)
-        })
+laps, _, _ = load_race(YEAR, RACE, SESSION)
 
-    except Exception as e:
-        print(f"❌ Fehler bei {drv}: {e}")
+# Alle Fahrer-Kennzahlen in einem groupby-Durchlauf
+agg = aggregate_lap_features(laps)
+agg["track_affinity"] = track_affinity_batch(RACE, agg.index)
+agg["team_strength"] = team_strength_batch(agg["team"])
+agg["momentum"] = momentum_batch(agg.index)
 
 # Speichern
-df = pd.DataFrame(features)
+df = agg.drop(columns="team").reset_index().rename(columns={"Driver": "driver"})
+df.insert(0, "year", YEAR)
+df.insert(1, "race", RACE)
 os.makedirs("data/live", exist_ok=True)
 path = f"data/live/driver_feature_data_{YEAR}_{RACE}.csv"
 df.to_csv(path, index=False)
@@ -9,10 +9,12 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 
 from utils.feature_engineering import (
-    get_track_affinity,
-    get_team_strength,
-    estimate_momentum
+    track_affinity_batch,
+    team_strength_batch,
+    momentum_batch,
+    aggregate_lap_features
 )
+from utils.session_cache import load_race
 
 fastf1.Cache.enable_cache("cache")
 
@@ -21,6 +23,10 @@ YEAR = 2023
 SESSIONS = ["R"]  # nur Rennen
 
 output_path = "data/processed/driver_feature_data.csv"
+COLUMNS = [
+    "year", "race", "driver", "fastest_lap", "avg_lap", "stints", "pitstops",
+    "laps_completed", "track_affinity", "team_strength", "momentum", "final_position"
+]
 os.makedirs("data/processed", exist_ok=True)
 
 all_data = []
@@ -32,51 +38,29 @@ for _, event in tqdm(events.iterrows(), total=len(events), desc=f"Lade Saison {Y
     gp_name = event["EventName"]
 
     try:
-        session = fastf1.get_session(YEAR, gp_name, "R")
-        session.load()
-        laps = session.laps.pick_quicklaps()
-        drivers = laps["Driver"].unique()
-
-        for drv in drivers:
-            d_laps = laps[laps["Driver"] == drv]
-            if d_laps.empty:
-                continue
-
-            try:
-                fastest_lap = d_laps["LapTime"].min().total_seconds()
-                avg_lap = d_laps["LapTime"].mean().total_seconds()
-                stints = d_laps["Stint"].nunique()
-                pitstops = d_laps["PitOutTime"].count()
-                laps_completed = d_laps["LapNumber"].max()
-                team = d_laps["Team"].iloc[0]
-                position = d_laps["Position"].iloc[-1]
-
-                row = {
-                    "year": YEAR,
-                    "race": gp_name,
-                    "driver": drv,
-                    "fastest_lap": fastest_lap,
-                    "avg_lap": avg_lap,
-                    "stints": stints,
-                    "pitstops": pitstops,
-                    "laps_completed": laps_completed,
-                    "track_affinity": get_track_affinity(gp_name, drv),
-                    "team_strength": get_team_strength(team),
-                    "momentum": estimate_momentum(drv),
-                    "final_position": int(position)
-                }
-
-                all_data.append(row)
-
-            except Exception as inner:
-                print(f"⚠️ Fehler bei Fahrer {drv} in {gp_name}: {inner}")
-                continue
+        laps, _, _ = load_race(YEAR, gp_name, "R")
+
+        # Alle Fahrer-Kennzahlen in einem groupby-Durchlauf
+        agg = aggregate_lap_features(laps)
+        # Position der letzten Runde wie iloc[-1], auch wenn sie NaN ist (.last() würde
+        # auf eine frühere Runde zurückfallen): solche Fahrer entfallen wie bisher
+        agg["final_position"] = laps.drop_duplicates("Driver", keep="last").set_index("Driver")["Position"]
+        agg = agg.dropna(subset=["final_position"])
+        agg["track_affinity"] = track_affinity_batch(gp_name, agg.index)
+        agg["team_strength"] = team_strength_batch(agg["team"])
+        agg["momentum"] = momentum_batch(agg.index)
+        agg["final_position"] = agg["final_position"].astype(int)
+
+        race_df = agg.drop(columns="team").reset_index().rename(columns={"Driver": "driver"})
+        race_df.insert(0, "year", YEAR)
+        race_df.insert(1, "race", gp_name)
+        all_data.append(race_df[COLUMNS])
 
     except Exception as outer:
         print(f"❌ GP {gp_name} übersprungen: {outer}")
         continue
 
 # Speichern
-df = pd.DataFrame(all_data)
+df = pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame(columns=COLUMNS)
 df.to_csv(output_path, index=False)
 print(f"✅ Gespeichert unter {output_path} mit {len(df)} Einträgen.")
@@ -1,5 +1,7 @@
 import os
+import sys
 import json
+import shutil
 import pandas as pd
 import requests
 from datetime import datetime, timedelta
@@ -7,7 +9,10 @@ import time
 import threading
 import logging
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 # Import our modules
+from utils.csv_cache import read_csv_cached
 from auto_race_monitor import AutoF1RaceMonitor
 from betting_strategy import generate_betting_recommendations
 from value_bet_calculator import calculate_value_bets
@@ -27,6 +32,14 @@ logger = logging.getLogger('live_dashboard')
 # Create logs directory if it doesn't exist
 os.makedirs('logs', exist_ok=True)
 
+def _atomic_write_json(path, obj):
+    """Write JSON to a temp file and swap it in so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    # Compact: these files are read by the dashboard, not edited by hand
+    with open(tmp_path, 'w') as f:
+        json.dump(obj, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
 class LiveDashboardUpdater:
     """
     Real-time dashboard updater that keeps the Streamlit dashboard
@@ -38,6 +51,7 @@ class LiveDashboardUpdater:
         self.monitor = AutoF1RaceMonitor()
         self.running = False
         self.update_thread = None
+        self._stop_event = threading.Event()
         
         # Dashboard data paths
         self.dashboard_data = {
@@ -47,6 +61,10 @@ class LiveDashboardUpdater:
             "value_bets": "data/live/top_value_bets.csv",
             "race_countdown": "data/live/race_countdown.json"
         }
+        
+        # Ensure directories exist
+        for file_path in self.dashboard_data.values():
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
     
     def get_next_race_info(self):
         """Get comprehensive next race information"""
@@ -89,7 +107,8 @@ class LiveDashboardUpdater:
             if not os.path.exists(odds_file):
                 return pd.DataFrame()
             
-            odds_df = pd.read_csv(odds_file)
+            # Only the columns the summary actually uses (the parse itself is cached per file)
+            odds_df = read_csv_cached(odds_file, columns=['driver', 'odds', 'bookmaker', 'fetch_timestamp'])
             
             if odds_df.empty:
                 return pd.DataFrame()
@@ -101,14 +120,14 @@ class LiveDashboardUpdater:
                 'fetch_timestamp': 'max'
             }).reset_index()
             
-            # Sort by odds (best value first)
-            best_odds = best_odds.sort_values('odds', ascending=False)
+            # Top 10 drivers by odds (best value first)
+            best_odds = best_odds.nlargest(10, 'odds')
             
-            # Add some formatting
-            best_odds['odds_formatted'] = best_odds['odds'].apply(lambda x: f"{x:.2f}")
+            # Add some formatting (only on the rows we return)
+            best_odds['odds_formatted'] = best_odds['odds'].map('{:.2f}'.format)
             best_odds['last_updated'] = pd.to_datetime(best_odds['fetch_timestamp']).dt.strftime('%H:%M')
             
-            return best_odds.head(10)  # Top 10 drivers
+            return best_odds
             
         except Exception as e:
             print(f"Error getting best odds summary: {e}")
@@ -122,7 +141,7 @@ class LiveDashboardUpdater:
             if not os.path.exists(rec_file):
                 return pd.DataFrame()
             
-            recommendations = pd.read_csv(rec_file)
+            recommendations = read_csv_cached(rec_file)
             
             if recommendations.empty:
                 return pd.DataFrame()
@@ -133,19 +152,19 @@ class LiveDashboardUpdater:
             if value_bets.empty:
                 return pd.DataFrame()
             
-            # Sort by expected value
-            value_bets = value_bets.sort_values('expected_value', ascending=False)
+            # Top 8 value bets by expected value
+            value_bets = value_bets.nlargest(8, 'expected_value')
             
-            # Add formatting
-            value_bets['ev_formatted'] = value_bets['expected_value'].apply(lambda x: f"{x:.3f}")
-            value_bets['odds_formatted'] = value_bets['odds'].apply(lambda x: f"{x:.2f}")
-            value_bets['probability_formatted'] = value_bets['probability_pct'].apply(lambda x: f"{x:.1f}%")
+            # Add formatting (only on the rows we return)
+            value_bets['ev_formatted'] = value_bets['expected_value'].map('{:.3f}'.format)
+            value_bets['odds_formatted'] = value_bets['odds'].map('{:.2f}'.format)
+            value_bets['probability_formatted'] = value_bets['probability_pct'].map('{:.1f}%'.format)
             
             # Calculate potential profit for €10 bet
             value_bets['potential_profit'] = (value_bets['odds'] * 10 - 10).round(2)
-            value_bets['potential_profit_formatted'] = value_bets['potential_profit'].apply(lambda x: f"€{x:.2f}")
+            value_bets['potential_profit_formatted'] = value_bets['potential_profit'].map('€{:.2f}'.format)
             
-            return value_bets.head(8)  # Top 8 value bets
+            return value_bets
             
         except Exception as e:
             print(f"Error getting top value bets: {e}")
@@ -156,15 +175,10 @@ class LiveDashboardUpdater:
         try:
             print(f"🔄 Updating dashboard data at {datetime.now().strftime('%H:%M:%S')}")
             
-            # Ensure directories exist
-            for file_path in self.dashboard_data.values():
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
             # 1. Update next race info
             race_info = self.get_next_race_info()
             if race_info:
-                with open(self.dashboard_data["next_race_info"], 'w') as f:
-                    json.dump(race_info, f, indent=2)
+                _atomic_write_json(self.dashboard_data["next_race_info"], race_info)
                 print(f"✅ Updated next race info: {race_info['race_name']}")
             
             # 2. Update best odds summary
@@ -181,10 +195,13 @@ class LiveDashboardUpdater:
             
             # 4. Copy latest recommendations to dashboard location
             rec_file = self.monitor.config['data_paths']['recommendations']
+            live_rec_file = self.dashboard_data["live_recommendations"]
             if os.path.exists(rec_file):
-                recommendations = pd.read_csv(rec_file)
-                recommendations.to_csv(self.dashboard_data["live_recommendations"], index=False)
-                print(f"✅ Updated live recommendations ({len(recommendations)} entries)")
+                # Plain file copy, no parse/serialize round-trip (skipped if both paths are the same file)
+                if os.path.abspath(rec_file) != os.path.abspath(live_rec_file):
+                    shutil.copyfile(rec_file, live_rec_file)
+                n_entries = len(read_csv_cached(rec_file))  # already parsed by get_top_value_bets
+                print(f"✅ Updated live recommendations ({n_entries} entries)")
             
             # 5. Create race countdown data
             if race_info:
@@ -199,8 +216,7 @@ class LiveDashboardUpdater:
                     "last_updated": datetime.now().isoformat()
                 }
                 
-                with open(self.dashboard_data["race_countdown"], 'w') as f:
-                    json.dump(countdown_data, f, indent=2)
+                _atomic_write_json(self.dashboard_data["race_countdown"], countdown_data)
                 print(f"✅ Updated race countdown")
             
             print(f"🎯 Dashboard data update completed successfully")
@@ -215,6 +231,7 @@ class LiveDashboardUpdater:
             return
         
         self.running = True
+        self._stop_event.clear()
         self.update_thread = threading.Thread(target=self._update_loop, daemon=True)
         self.update_thread.start()
         print(f"🚀 Started background dashboard updates (every {self.update_interval//60} minutes)")
@@ -222,6 +239,7 @@ class LiveDashboardUpdater:
     def stop_background_updates(self):
         """Stop background updates"""
         self.running = False
+        self._stop_event.set()
         if self.update_thread:
             self.update_thread.join(timeout=5)
         print("🛑 Stopped background dashboard updates")
@@ -232,15 +250,14 @@ class LiveDashboardUpdater:
             try:
                 self.update_dashboard_data()
                 
-                # Sleep in small intervals to allow for quick shutdown
-                for _ in range(int(self.update_interval)):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                # Block until the next tick; returns early on shutdown
+                if self._stop_event.wait(self.update_interval):
+                    break
                     
             except Exception as e:
                 print(f"Error in update loop: {e}")
-                time.sleep(60)  # Wait a minute before retrying
+                if self._stop_event.wait(60):  # Wait a minute before retrying
+                    break
     
     def force_update(self):
         """Force an immediate update"""
@@ -14,12 +14,12 @@ output_path = f"data/logged/results_{YEAR}_{RACE_NAME}.csv"
 # 📡 Lade Session
 fastf1.Cache.enable_cache("cache")
 session = fastf1.get_session(YEAR, RACE_NAME, SESSION_TYPE)
-session.load()
+session.load(telemetry=False, weather=False, messages=False)  # nur Rundendaten nötig
 
 # 📊 Ergebnisse extrahieren
 laps = session.laps
 results = (
-    laps.groupby("Driver")["Position"]
+    laps.groupby("Driver", sort=False)["Position"]
     .min()
     .reset_index()
     .rename(columns={"Position": "final_position"})
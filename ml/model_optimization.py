@@ -1,10 +1,15 @@
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import GridSearchCV, cross_val_score, StratifiedKFold
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import GridSearchCV, HalvingRandomSearchCV, ParameterGrid, StratifiedKFold, cross_val_predict
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 from sklearn.preprocessing import LabelEncoder
-import pickle
+import joblib
+import hashlib
+import json
 import os
 import time
 from datetime import datetime
@@ -19,24 +24,45 @@ class F1ModelOptimizer:
     Klasse zur Optimierung von F1-Platzierungsmodellen mit GridSearchCV.
     """
     
-    def __init__(self, random_state: int = 42):
+    def __init__(self, random_state: int = 42, cache_dir: str = ".cache"):
         self.random_state = random_state
+        self.cache_dir = cache_dir
         self.best_model = None
         self.best_params = None
         self.best_score = None
         self.grid_search = None
+        self.cv = None
         self.optimization_history = []
         
-    def prepare_data(self, data_path: str) -> Tuple[np.ndarray, np.ndarray, list]:
+    def prepare_data(self, data_path: str, use_cache: bool = True) -> Tuple[np.ndarray, np.ndarray, list]:
         """
         Bereitet die Trainingsdaten vor.
         
         Args:
             data_path: Pfad zur CSV-Datei mit Trainingsdaten
+            use_cache: Ob die vorbereitete Feature-Matrix zwischengespeichert werden soll
+                (Schlüssel: Pfad, Änderungszeit und Größe der CSV)
             
         Returns:
-            Tuple aus (X, y, feature_names)
+            Tuple aus (X, y, feature_names) mit X als float32 und y als int8.
+            Spätere .predict()-Aufrufe sollten ebenfalls float32 übergeben,
+            sonst legt sklearn intern eine umgewandelte Kopie an.
         """
+        cache_path = None
+        if use_cache:
+            stat = os.stat(data_path)
+            key = hashlib.md5(
+                f"{os.path.abspath(data_path)}:{stat.st_mtime_ns}:{stat.st_size}".encode()
+            ).hexdigest()
+            cache_path = os.path.join(self.cache_dir, f"prepared_{key}.npz")
+            
+            if os.path.exists(cache_path):
+                cached = np.load(cache_path, allow_pickle=False)
+                X, y, feature_cols = cached['X'], cached['y'], cached['feature_cols'].tolist()
+                print(f"⚡ Vorbereitete Daten aus Cache geladen: {cache_path}")
+                print(f"✅ Daten vorbereitet: X={X.shape}, y={y.shape}")
+                return X, y, feature_cols
+        
         print(f"📊 Lade Trainingsdaten: {data_path}")
         df = pd.read_csv(data_path)
         
@@ -58,9 +84,17 @@ class F1ModelOptimizer:
             print("⚠️ Fehlende Werte in Features gefunden - werden mit 0 ersetzt")
             X = np.nan_to_num(X, 0)
         
+        # float32 halbiert den Speicherverkehr beim Split-Scan; Platzierungen passen in int8
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        y = y.astype(np.int8, copy=False)
+        
         print(f"✅ Daten vorbereitet: X={X.shape}, y={y.shape}")
         print(f"📊 Ziel-Verteilung: {np.bincount(y.astype(int))}")
         
+        if cache_path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.savez(cache_path, X=X, y=y, feature_cols=np.array(feature_cols))
+        
         return X, y, feature_cols
     
     def get_parameter_grid(self, grid_type: str = 'comprehensive') -> Dict[str, Any]:
@@ -76,32 +110,28 @@ class F1ModelOptimizer:
         if grid_type == 'quick':
             # Schnelle Suche für Tests
             param_grid = {
-                'n_estimators': [50, 100],
-                'max_depth': [10, 20, None],
-                'min_samples_split': [2, 5],
-                'min_samples_leaf': [1, 2],
-                'max_features': ['sqrt', 'log2']
+                'learning_rate': [0.05, 0.1],
+                'max_leaf_nodes': [15, 31],
+                'min_samples_leaf': [10, 20],
+                'l2_regularization': [0.0, 1.0]
             }
         elif grid_type == 'comprehensive':
             # Umfassende Suche (empfohlen)
             param_grid = {
-                'n_estimators': [100, 200, 300],
-                'max_depth': [10, 20, 30, None],
-                'min_samples_split': [2, 5, 10],
-                'min_samples_leaf': [1, 2, 4],
-                'max_features': ['sqrt', 'log2', None],
-                'bootstrap': [True, False]
+                'learning_rate': [0.01, 0.05, 0.1, 0.3],
+                'max_leaf_nodes': [11, 31, 81],
+                'min_samples_leaf': [5, 20, 200],
+                'l2_regularization': [0.0, 0.5, 1.0, 5.0]
             }
         elif grid_type == 'extensive':
             # Sehr umfassende Suche (dauert lange)
             param_grid = {
-                'n_estimators': [50, 100, 200, 300, 500],
-                'max_depth': [5, 10, 15, 20, 25, 30, None],
-                'min_samples_split': [2, 5, 10, 15],
-                'min_samples_leaf': [1, 2, 4, 8],
-                'max_features': ['sqrt', 'log2', 0.3, 0.5, None],
-                'bootstrap': [True, False],
-                'criterion': ['gini', 'entropy']
+                'learning_rate': [0.01, 0.03, 0.05, 0.1, 0.2, 0.3],
+                'max_leaf_nodes': [7, 11, 15, 31, 63, 81],
+                'max_depth': [5, 10, None],
+                'min_samples_leaf': [5, 10, 20, 50, 200],
+                'l2_regularization': [0.0, 0.1, 0.5, 1.0, 5.0],
+                'max_bins': [63, 255]
             }
         else:
             raise ValueError(f"Unbekannter grid_type: {grid_type}")
@@ -117,9 +147,11 @@ class F1ModelOptimizer:
                       grid_type: str = 'comprehensive',
                       cv_folds: int = 5, 
                       scoring: str = 'accuracy',
-                      n_jobs: int = -1) -> Dict[str, Any]:
+                      n_jobs: int = -1,
+                      search_type: str = 'halving',
+                      target_score: float = None) -> Dict[str, Any]:
         """
-        Führt GridSearchCV zur Modell-Optimierung durch.
+        Führt eine Hyperparameter-Suche zur Modell-Optimierung durch.
         
         Args:
             X: Feature-Matrix
@@ -128,35 +160,80 @@ class F1ModelOptimizer:
             cv_folds: Anzahl Cross-Validation Folds
             scoring: Scoring-Metrik
             n_jobs: Anzahl paralleler Jobs
+            search_type: 'halving' (HalvingRandomSearchCV, verwirft schwache
+                Kandidaten früh auf kleinen Teilmengen) oder 'grid' (GridSearchCV,
+                vollständige Suche)
+            target_score: Optionaler Ziel-Score; bei search_type='grid' wird das Grid
+                in Teilstücken durchsucht und abgebrochen, sobald er erreicht ist
             
         Returns:
             Dictionary mit Optimierungsergebnissen
         """
-        print(f"🚀 Starte GridSearchCV-Optimierung...")
+        if search_type not in ('halving', 'grid'):
+            raise ValueError(f"Unbekannter search_type: {search_type}")
+        if target_score is not None and search_type != 'grid':
+            print("⚠️ target_score wird nur bei search_type='grid' berücksichtigt")
+        
+        print(f"🚀 Starte {'HalvingRandomSearchCV' if search_type == 'halving' else 'GridSearchCV'}-Optimierung...")
         start_time = time.time()
         
         # Parameter-Grid
         param_grid = self.get_parameter_grid(grid_type)
         
-        # Base-Modell
-        rf = RandomForestClassifier(random_state=self.random_state)
+        # Base-Modell: Histogramm-Boosting, bricht bei Plateau selbst ab
+        base_model = HistGradientBoostingClassifier(
+            max_iter=200,
+            early_stopping=True,
+            validation_fraction=0.1,
+            n_iter_no_change=30,
+            tol=1e-7,
+            random_state=self.random_state
+        )
         
         # Cross-Validation Strategy
         cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=self.random_state)
-        
-        # GridSearchCV
-        self.grid_search = GridSearchCV(
-            estimator=rf,
-            param_grid=param_grid,
-            cv=cv,
-            scoring=scoring,
-            n_jobs=n_jobs,
-            verbose=1,
-            return_train_score=True
-        )
-        
-        print(f"⏱️ Starte Suche mit {cv_folds}-Fold CV...")
-        self.grid_search.fit(X, y)
+        self.cv = cv
+        
+        if search_type == 'halving':
+            # Successive Halving: nur die besten Kandidaten sehen den vollen Datensatz.
+            # Die kleinste Teilmenge muss groß genug sein, damit der Early-Stopping-Split
+            # (validation_fraction) in jedem CV-Fold noch alle Klassen enthält.
+            n_classes = len(np.unique(y))
+            min_resources = min(len(y), int(np.ceil(n_classes / 0.1 * cv_folds / (cv_folds - 1))))
+            self.grid_search = HalvingRandomSearchCV(
+                estimator=base_model,
+                param_distributions=param_grid,
+                n_candidates=len(ParameterGrid(param_grid)),
+                factor=3,
+                resource='n_samples',
+                min_resources=min_resources,
+                cv=cv,
+                scoring=scoring,
+                n_jobs=n_jobs,
+                verbose=1,
+                return_train_score=True,
+                random_state=self.random_state
+            )
+        elif target_score is None:
+            self.grid_search = GridSearchCV(
+                estimator=base_model,
+                param_grid=param_grid,
+                cv=cv,
+                scoring=scoring,
+                n_jobs=n_jobs,
+                verbose=1,
+                return_train_score=True
+            )
+        
+        print(f"⏱️ Starte Suche mit {cv_folds}-Fold CV ({joblib.cpu_count()} CPU-Kerne)...")
+        # Ein OpenMP/BLAS-Thread pro Worker verhindert n_cores × n_cores Threads
+        with joblib.parallel_backend('loky', inner_max_num_threads=1):
+            if search_type == 'grid' and target_score is not None:
+                self.grid_search = self._fit_grid_in_shards(
+                    base_model, param_grid, cv, scoring, n_jobs, X, y, target_score
+                )
+            else:
+                self.grid_search.fit(X, y)
         
         # Beste Parameter und Score
         self.best_model = self.grid_search.best_estimator_
@@ -174,7 +251,8 @@ class F1ModelOptimizer:
             'total_fits': len(self.grid_search.cv_results_['params']),
             'cv_folds': cv_folds,
             'scoring': scoring,
-            'grid_type': grid_type
+            'grid_type': grid_type,
+            'search_type': search_type
         }
         
         self.optimization_history.append({
@@ -191,6 +269,59 @@ class F1ModelOptimizer:
         
         return results
     
+    def _fit_grid_in_shards(self, base_model, param_grid: Dict[str, Any], cv, scoring: str,
+                            n_jobs: int, X: np.ndarray, y: np.ndarray,
+                            target_score: float, shard_size: int = 20) -> GridSearchCV:
+        """
+        Durchsucht das Grid in Teilstücken von shard_size Kandidaten und bricht ab,
+        sobald target_score erreicht ist. Die cv_results_ aller Teilsuchen werden
+        zusammengeführt, damit Bericht und Evaluation unverändert funktionieren.
+        """
+        candidates = [{k: [v] for k, v in params.items()} for params in ParameterGrid(param_grid)]
+        shard_results = []
+        
+        for start in range(0, len(candidates), shard_size):
+            search = GridSearchCV(
+                estimator=base_model,
+                param_grid=candidates[start:start + shard_size],
+                cv=cv,
+                scoring=scoring,
+                n_jobs=n_jobs,
+                verbose=1,
+                return_train_score=True,
+                refit=False
+            )
+            search.fit(X, y)
+            shard_results.append(search.cv_results_)
+            
+            if np.nanmax(search.cv_results_['mean_test_score']) >= target_score:
+                n_done = min(start + shard_size, len(candidates))
+                print(f"🎯 Ziel-Score {target_score:.4f} erreicht nach {n_done}/{len(candidates)} Kandidaten")
+                break
+        
+        merged = {}
+        for key in shard_results[0]:
+            if key == 'params':
+                merged[key] = [p for r in shard_results for p in r[key]]
+            elif key.startswith('param_'):
+                merged[key] = np.ma.concatenate([r[key] for r in shard_results])
+            else:
+                merged[key] = np.concatenate([r[key] for r in shard_results])
+        mean_scores = np.nan_to_num(merged['mean_test_score'], nan=-np.inf)
+        merged['rank_test_score'] = (
+            pd.Series(mean_scores).rank(method='min', ascending=False).to_numpy(dtype=np.int32)
+        )
+        
+        # Letzte Teilsuche trägt die zusammengeführten Ergebnisse und den Refit des Besten
+        best_index = int(np.argmax(mean_scores))
+        search.cv_results_ = merged
+        search.best_index_ = best_index
+        search.best_params_ = merged['params'][best_index]
+        search.best_score_ = merged['mean_test_score'][best_index]
+        search.best_estimator_ = clone(base_model).set_params(**search.best_params_).fit(X, y)
+        
+        return search
+    
     def evaluate_model(self, X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
         """
         Evaluiert das beste Modell.
@@ -207,30 +338,35 @@ class F1ModelOptimizer:
         
         print(f"📊 Evaluiere bestes Modell...")
         
-        # Cross-Validation Scores
-        cv_scores = cross_val_score(
-            self.best_model, X, y, 
-            cv=StratifiedKFold(n_splits=5, shuffle=True, random_state=self.random_state),
-            scoring='accuracy'
-        )
+        # Cross-Validation Scores des besten Kandidaten aus der Suche übernehmen
+        # (gleiche Folds, kein erneutes Training nötig)
+        cv_results = self.grid_search.cv_results_
+        best_index = self.grid_search.best_index_
+        n_splits = self.grid_search.n_splits_
+        cv_scores = np.array([cv_results[f'split{i}_test_score'][best_index] for i in range(n_splits)])
         
-        # Feature Importance
-        feature_importance = self.best_model.feature_importances_
+        # Out-of-Fold-Vorhersagen auf denselben Folds wie die Suche (cv_folds zusätzliche Fits):
+        # ehrliche Confusion Matrix statt In-Sample-Vorhersage
+        y_pred_oof = cross_val_predict(self.best_model, X, y, cv=self.cv, n_jobs=-1, method='predict')
         
-        # Vorhersagen für Confusion Matrix
-        y_pred = self.best_model.predict(X)
+        # Feature Importance (HistGradientBoosting hat kein feature_importances_)
+        feature_importance = permutation_importance(
+            self.best_model, X, y, n_repeats=5, random_state=self.random_state, n_jobs=-1
+        ).importances_mean
         
         results = {
             'cv_mean': cv_scores.mean(),
             'cv_std': cv_scores.std(),
             'cv_scores': cv_scores.tolist(),
-            'train_accuracy': accuracy_score(y, y_pred),
+            'train_accuracy': accuracy_score(y, self.best_model.predict(X)),
+            'oof_accuracy': accuracy_score(y, y_pred_oof),
             'feature_importance': feature_importance.tolist(),
-            'confusion_matrix': confusion_matrix(y, y_pred).tolist()
+            'confusion_matrix': confusion_matrix(y, y_pred_oof).tolist()
         }
         
         print(f"📈 CV-Score: {results['cv_mean']:.4f} ± {results['cv_std']:.4f}")
         print(f"📈 Train-Accuracy: {results['train_accuracy']:.4f}")
+        print(f"📈 OOF-Accuracy: {results['oof_accuracy']:.4f}")
         
         return results
     
@@ -249,19 +385,19 @@ class F1ModelOptimizer:
         
         if include_metadata:
             # Speichere Modell mit Metadaten
-            model_data = {
+            payload = {
                 'model': self.best_model,
                 'best_params': self.best_params,
                 'best_score': self.best_score,
                 'optimization_history': self.optimization_history,
                 'timestamp': datetime.now()
             }
-            with open(filepath, 'wb') as f:
-                pickle.dump(model_data, f)
         else:
             # Speichere nur das Modell
-            with open(filepath, 'wb') as f:
-                pickle.dump(self.best_model, f)
+            payload = self.best_model
+        
+        # Komprimiertes Archiv (deutlich kleiner als ein roher Pickle)
+        joblib.dump(payload, filepath, compress=3)
         
         print(f"💾 Bestes Modell gespeichert: {filepath}")
     
@@ -283,9 +419,11 @@ class F1ModelOptimizer:
         # Top 10 Modelle
         top_models = results_df.nlargest(10, 'mean_test_score')
         
-        # Speichere detaillierte Ergebnisse
-        results_df.to_csv(f"{output_dir}/grid_search_results.csv", index=False)
-        top_models.to_csv(f"{output_dir}/top_10_models.csv", index=False)
+        # Speichere detaillierte Ergebnisse; die dict-Spalte 'params' ist redundant zu den
+        # param_*-Spalten und landet separat als JSON (Top 10 stehen im Text-Bericht)
+        results_df.drop(columns=['params']).to_csv(f"{output_dir}/grid_search_results.csv", index=False)
+        with open(f"{output_dir}/grid_search_params.json", 'w', encoding='utf-8') as f:
+            json.dump([dict(p) for p in results_df['params']], f, default=str)
         
         # Visualisierungen
         self._create_optimization_plots(results_df, output_dir)
@@ -311,34 +449,37 @@ class F1ModelOptimizer:
         Erstellt Visualisierungen der Optimierungsergebnisse.
         """
         # Parameter-Wichtigkeit Plot
-        plt.figure(figsize=(15, 10))
-        
-        # Extrahiere Parameter-Werte
         param_cols = [col for col in results_df.columns if col.startswith('param_')]
         
+        # Mittelwert/Std pro (Parameter, Wert) in einem einzigen groupby
+        stats = (
+            results_df[param_cols + ['mean_test_score']]
+            .melt(id_vars='mean_test_score', var_name='param', value_name='val')
+            .groupby(['param', 'val'], sort=False)['mean_test_score']
+            .agg(['mean', 'std'])
+            .reset_index()
+        )
+        
         n_params = len(param_cols)
         n_cols = 3
-        n_rows = (n_params + n_cols - 1) // n_cols
+        n_rows = max((n_params + n_cols - 1) // n_cols, 1)
+        fig, axes = plt.subplots(n_rows, n_cols, figsize=(15, 10), squeeze=False)
         
-        for i, param_col in enumerate(param_cols):
-            plt.subplot(n_rows, n_cols, i + 1)
-            
-            param_name = param_col.replace('param_', '')
-            
-            # Gruppiere nach Parameter-Wert
-            grouped = results_df.groupby(param_col)['mean_test_score'].agg(['mean', 'std']).reset_index()
+        for ax, param_col in zip(axes.flat, param_cols):
+            grouped = stats[stats['param'] == param_col].sort_values('val')
             
             if len(grouped) > 1:
-                plt.errorbar(range(len(grouped)), grouped['mean'], yerr=grouped['std'], 
-                           marker='o', capsize=5)
-                plt.xticks(range(len(grouped)), grouped[param_col], rotation=45)
-                plt.title(f'{param_name}')
-                plt.ylabel('CV Score')
-                plt.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        plt.savefig(f"{output_dir}/parameter_analysis.png", dpi=300, bbox_inches='tight')
-        plt.close()
+                ax.errorbar(range(len(grouped)), grouped['mean'], yerr=grouped['std'],
+                            marker='o', capsize=5)
+                ax.set_xticks(range(len(grouped)))
+                ax.set_xticklabels(grouped['val'], rotation=45)
+                ax.set_title(param_col.replace('param_', ''))
+                ax.set_ylabel('CV Score')
+                ax.grid(True, alpha=0.3)
+        
+        fig.tight_layout()
+        fig.savefig(f"{output_dir}/parameter_analysis.png", dpi=300, bbox_inches='tight')
+        plt.close(fig)
         
         # Score-Verteilung
         plt.figure(figsize=(10, 6))
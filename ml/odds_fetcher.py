@@ -1,36 +1,58 @@
 import requests
+import numpy as np
 import pandas as pd
 import os
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-ODDS_API_KEY = os.getenv("2f9fca6868ae22ca7596e457d8ce7020")  
+ODDS_API_KEY = os.getenv("ODDS_API_KEY")
 ODDS_API_URL = "https://api.the-odds-api.com/v4/sports/formula_1/odds/"
+ODDS_COLUMNS = ["driver", "odds", "bookmaker", "market", "event"]
+
+# Eine Session für alle Requests: Verbindungen (TCP/TLS) werden wiederverwendet
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
 
 def fetch_f1_odds(api_key=ODDS_API_KEY, region="eu", market="outrights"):
+    if not api_key:
+        raise ValueError("ODDS_API_KEY ist nicht gesetzt (Umgebungsvariable oder api_key übergeben)")
     params = {
         "apiKey": api_key,
         "regions": region,
         "markets": market,
     }
-    response = requests.get(ODDS_API_URL, params=params)
+    response = _SESSION.get(ODDS_API_URL, params=params, timeout=10)
     if response.status_code != 200:
         raise Exception(f"API request failed: {response.status_code} {response.text}")
 
     data = response.json()
-    odds_data = []
-
-    for entry in data:
-        for bookmaker in entry.get("bookmakers", []):
-            for market in bookmaker.get("markets", []):
-                for outcome in market.get("outcomes", []):
-                    odds_data.append({
-                        "driver": outcome["name"],
-                        "odds": outcome["price"],
-                        "bookmaker": bookmaker["title"],
-                        "market": market["key"],
-                        "event": entry["home_team"] + " vs " + entry.get("away_team", "") if entry.get("away_team") else entry.get("home_team")
-                    })
-
-    return pd.DataFrame(odds_data)
+    if not data:
+        return pd.DataFrame(columns=ODDS_COLUMNS)
+
+    # Verschachteltes JSON (Event -> Buchmacher -> Markt -> Outcome) in einem Schritt flach machen
+    df = pd.json_normalize(
+        data,
+        record_path=["bookmakers", "markets", "outcomes"],
+        meta=["home_team", "away_team", ["bookmakers", "title"], ["bookmakers", "markets", "key"]],
+        errors="ignore",
+    )
+    if df.empty:
+        return pd.DataFrame(columns=ODDS_COLUMNS)
+
+    away = df["away_team"].fillna("") if "away_team" in df else pd.Series("", index=df.index)
+    df["event"] = np.where(away != "", df["home_team"] + " vs " + away, df["home_team"])
+
+    df = df.rename(columns={
+        "name": "driver",
+        "price": "odds",
+        "bookmakers.title": "bookmaker",
+        "bookmakers.markets.key": "market",
+    })
+    return df[ODDS_COLUMNS]
 
 def save_odds_to_csv(df, path="data/live/odds_latest.csv"):
     df.to_csv(path, index=False)
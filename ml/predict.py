@@ -0,0 +1,182 @@
+import os
+import sys
+import argparse
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import fastf1
+import joblib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.feature_engineering import (
+    track_affinity_batch,
+    team_strength_batch,
+    momentum_batch,
+    aggregate_lap_features
+)
+from utils.session_cache import get_laps
+
+fastf1.Cache.enable_cache("cache")
+
+FEATURES = [
+    "fastest_lap", "avg_lap", "stints", "pitstops", "laps_completed",
+    "track_affinity", "team_strength", "momentum"
+]
+
+# Ausgabe -> Modell-Datei
+MODEL_PATHS = {
+    "position": "models/rf_model.pkl",
+    "regression": "models/rf_model_regression.pkl",
+    "top10": "models/rf_model_top10.pkl",
+    "live": "models/rf_model_position_classifier.pkl",
+}
+
+
+@lru_cache(maxsize=None)
+def load_model(path: str):
+    """Lädt ein Modell einmal pro Prozess (komprimiert gespeichert -> kein mmap)."""
+    return joblib.load(path)
+
+
+def latest_completed_race(year: int):
+    """Name des letzten abgeschlossenen Rennens der Saison oder None."""
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    now = pd.Timestamp.now(tz="UTC")
+    available_races = schedule[schedule["Session5Date"] < now]
+    if available_races.empty:
+        return None
+    return available_races.iloc[-1]["EventName"]
+
+
+def build_features(year: int, race: str, session_type: str = "R") -> pd.DataFrame:
+    """Feature-Matrix für alle Fahrer eines Rennens (Index = Fahrerkürzel)."""
+    return features_from_laps(get_laps(year, race, session_type), race)
+
+
+def features_from_laps(laps: pd.DataFrame, race: str) -> pd.DataFrame:
+    """Feature-Matrix aus bereits geladenen Quick-Laps eines Rennens."""
+    # Feature-Berechnung für alle Fahrer in einem groupby-Durchlauf
+    X = aggregate_lap_features(laps)
+    X["track_affinity"] = track_affinity_batch(race, X.index)
+    X["team_strength"] = team_strength_batch(X["team"])
+    X["momentum"] = momentum_batch(X.index)
+
+    # Fahrer mit unvollständigen Features überspringen
+    complete = X[FEATURES].notna().all(axis=1)
+    for drv in X.index[~complete]:
+        print(f"⚠️ Unvollständige Features für {drv} – übersprungen")
+    return X.loc[complete, FEATURES].astype("float32")  # Bäume rechnen intern mit float32
+
+
+def _predict_position(model, X, year, race):
+    proba = model.predict_proba(X)
+    df = pd.DataFrame(proba.round(4), columns=[f"p_place_{c}" for c in model.classes_])
+    df.insert(0, "driver", X.index)
+    # Klasse aus derselben Wahrscheinlichkeitsmatrix statt zweitem Durchlauf über predict()
+    df.insert(1, "predicted_position", model.classes_[proba.argmax(axis=1)].astype(int))
+    return df, "data/processed/predicted_driver_positions.csv"
+
+
+def _predict_regression(model, X, year, race):
+    df = pd.DataFrame({
+        "year": year,
+        "race": race,
+        "driver": X.index,
+        "expected_position": model.predict(X).round(2)
+    })
+    return df, "data/processed/predicted_positions_regression.csv"
+
+
+def _predict_top10(model, X, year, race):
+    # Spalte der Klasse 1 (Top 10) explizit über classes_ wählen statt fester Position
+    prob = model.predict_proba(X)[:, list(model.classes_).index(1)]
+    df = pd.DataFrame({
+        "year": year,
+        "race": race,
+        "driver": X.index,
+        "top10_probability": (prob * 100).round(2)
+    })
+    return df, "data/processed/predicted_top10_probabilities.csv"
+
+
+def position_probability_table(model, X: pd.DataFrame, year: int, race: str) -> pd.DataFrame:
+    """Platz-Wahrscheinlichkeiten in Prozent, eine Zeile pro Fahrer und Platz."""
+    proba = model.predict_proba(X)
+    n_drivers, n_positions = proba.shape
+    n_rows = n_drivers * n_positions
+    return pd.DataFrame({
+        "year": np.full(n_rows, year, dtype=np.int16),
+        "race": pd.Categorical(np.repeat(race, n_rows)),
+        "driver": np.repeat(X.index.to_numpy(), n_positions),
+        "position": np.tile(np.arange(1, n_positions + 1, dtype=np.int8), n_drivers),
+        "probability": (proba.ravel() * 100).round(2)
+    })
+
+
+def _predict_live(model, X, year, race):
+    df = position_probability_table(model, X, year, race)
+    return df, f"data/live/predicted_probabilities_{year}_{race}.csv"
+
+
+PREDICTORS = {
+    "position": _predict_position,
+    "regression": _predict_regression,
+    "top10": _predict_top10,
+    "live": _predict_live,
+}
+
+
+def predict(year: int, race: str = None, outputs=("position", "regression", "top10"),
+            session_type: str = "R") -> dict:
+    """
+    Lädt die Session einmal, baut die Feature-Matrix einmal und führt alle
+    angeforderten Modelle darauf aus. Jede Ausgabe wird als CSV gespeichert.
+
+    Args:
+        year: Saison
+        race: Rennname; None = letztes abgeschlossenes Rennen der Saison
+        outputs: Auswahl aus 'position', 'regression', 'top10', 'live'
+        session_type: FastF1-Session (Standard: Rennen)
+
+    Returns:
+        Dictionary {Ausgabe: DataFrame}
+    """
+    unknown = set(outputs) - set(PREDICTORS)
+    if unknown:
+        raise ValueError(f"Unbekannte Ausgabe(n): {sorted(unknown)}")
+
+    if race is None:
+        race = latest_completed_race(year)
+        if race is None:
+            print("⚠️ Es gibt noch kein abgeschlossenes Rennen in dieser Saison.")
+            return {}
+        print(f"\n🟢 Letztes abgeschlossenes Rennen erkannt: {race} ({year})")
+
+    print(f"\n📊 Vorhersage für {race} {year}: {', '.join(outputs)}")
+    X = build_features(year, race, session_type)
+
+    frames = {}
+    for output in outputs:
+        df, out_path = PREDICTORS[output](load_model(MODEL_PATHS[output]), X, year, race)
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        df.to_csv(out_path, index=False, lineterminator="\n")
+        print(f"✅ {output}: gespeichert unter {out_path}")
+        frames[output] = df
+
+    return frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="F1-Vorhersagen für alle Fahrer eines Rennens")
+    parser.add_argument("--year", type=int, default=2023)
+    parser.add_argument("--race", default=None,
+                        help="Rennname (Standard: letztes abgeschlossenes Rennen der Saison)")
+    parser.add_argument("--output", nargs="+", choices=list(PREDICTORS),
+                        default=["position", "regression", "top10"])
+    args = parser.parse_args(argv)
+    return predict(args.year, args.race, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ YEAR = 2023
 DRIVER_CODE = "VER"  # 3-Buchstaben Kürzel
 
 # Modell laden
-model = joblib.load("models/rf_model.pkl")
+model = joblib.load("models/rf_model.pkl")  # komprimiert gespeichert -> kein mmap
 
 # Session laden
 event = fastf1.get_event(YEAR, RACE_NAME)
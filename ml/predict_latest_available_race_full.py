@@ -1,14 +1,17 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
 import fastf1
 import joblib
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.feature_engineering import (
-    get_track_affinity,
-    get_team_strength,
-    estimate_momentum
+    track_affinity_batch,
+    team_strength_batch,
+    momentum_batch,
+    aggregate_lap_features
 )
+from utils.session_cache import load_race
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 fastf1.Cache.enable_cache("cache")
@@ -30,6 +33,8 @@ HOME_TRACKS = {
     "TSU": "Japan", "ALB": "Thailand", "ZHO": "China", "HUL": "Germany", "PER": "Mexico",
     "NOR": "Great Britain", "PIA": "Australia", "MAG": "Denmark"
 }
+# Als Series für vektorisierte Lookups (Ländernamen als category)
+HOME_TRACKS_S = pd.Series(HOME_TRACKS, dtype="category")
 
 # 📅 Letztes beendetes Rennen finden
 schedule = fastf1.get_event_schedule(YEAR)
@@ -44,67 +49,45 @@ race_name = available.iloc[-1]["EventName"]
 print(f"\n🟢 Live-Vorhersage für: {race_name} {YEAR}")
 
 # 🧠 Modell laden
-model = joblib.load(MODEL_PATH)
+model = joblib.load(MODEL_PATH)  # komprimiert gespeichert -> kein mmap
 
 # 📥 Daten abrufen
-session = fastf1.get_session(YEAR, race_name, SESSION_TYPE)
-session.load()
-laps = session.laps.pick_quicklaps()
-results = session.results
-weather = session.weather_data
-drivers = laps["Driver"].unique()
-
-# 📊 Features erzeugen
-rows = []
-
-for drv in drivers:
-    d_laps = laps[laps["Driver"] == drv]
-    if d_laps.empty: continue
-
-    try:
-        fastest = d_laps["LapTime"].min().total_seconds()
-        avg = d_laps["LapTime"].mean().total_seconds()
-        pitstops = d_laps["PitOutTime"].count()
-        team = d_laps["Team"].iloc[0]
-
-        start_pos = results[results["Abbreviation"] == drv]["GridPosition"].values[0] if drv in results["Abbreviation"].values else None
-        air_temp = weather["AirTemp"].mean() if not weather.empty else None
-        humidity = weather["Humidity"].mean() if not weather.empty else None
-        rain = weather["Rainfall"].mean() if not weather.empty else None
-        home = 1 if HOME_TRACKS.get(drv, "") == race_name else 0
-
-        X = pd.DataFrame([{
-            "fastest_lap": fastest,
-            "avg_lap": avg,
-            "pitstops": pitstops,
-            "track_affinity": get_track_affinity(race_name, drv),
-            "team_strength": get_team_strength(team),
-            "momentum": estimate_momentum(drv),
-            "start_position": start_pos,
-            "air_temp": air_temp,
-            "humidity": humidity,
-            "rain": rain,
-            "home_race": home
-        }])
-
-        proba = model.predict_proba(X)[0]
-        for i, p in enumerate(proba, start=1):
-            rows.append({
-                "year": YEAR,
-                "race": race_name,
-                "driver": drv,
-                "position": i,
-                "probability": round(p * 100, 2)
-            })
-
-    except Exception as e:
-        print(f"⚠️ Fehler bei {drv}: {e}")
+laps, weather, results = load_race(YEAR, race_name, SESSION_TYPE)
+
+# 📊 Features für alle Fahrer auf einmal erzeugen
+X = aggregate_lap_features(laps)
+X["track_affinity"] = track_affinity_batch(race_name, X.index)
+X["team_strength"] = team_strength_batch(X["team"])
+X["momentum"] = momentum_batch(X.index)
+X["start_position"] = results.set_index("Abbreviation")["GridPosition"].reindex(X.index)
+
+# Wetter ist für alle Fahrer gleich -> einmal mitteln und broadcasten
+for col, src in (("air_temp", "AirTemp"), ("humidity", "Humidity"), ("rain", "Rainfall")):
+    X[col] = weather[src].mean() if not weather.empty else np.nan
+X["home_race"] = HOME_TRACKS_S.reindex(X.index).eq(race_name).to_numpy(dtype=np.int8)
+
+# Fahrer mit unvollständigen Features überspringen
+complete = X[FEATURES].notna().all(axis=1)
+for drv in X.index[~complete]:
+    print(f"⚠️ Unvollständige Features für {drv} – übersprungen")
+X = X.loc[complete, FEATURES]
+
+# Eine Vorhersage für alle Fahrer, danach eine Zeile pro Fahrer und Platz
+proba = model.predict_proba(X)
+n_drivers, n_positions = proba.shape
+n_rows = n_drivers * n_positions
+df = pd.DataFrame({
+    "year": np.full(n_rows, YEAR, dtype=np.int16),
+    "race": pd.Categorical(np.repeat(race_name, n_rows)),
+    "driver": np.repeat(X.index.to_numpy(), n_positions),
+    "position": np.tile(np.arange(1, n_positions + 1, dtype=np.int8), n_drivers),
+    "probability": (proba.ravel() * 100).round(2)
+})
 
 # 💾 Speichern
-df = pd.DataFrame(rows)
 os.makedirs("data/live", exist_ok=True)
 path = f"data/live/predicted_probabilities_{YEAR}_{race_name.replace(' ', '_')}_full.csv"
-df.to_csv(path, index=False)
+df.to_csv(path, index=False, lineterminator="\n")
 
 print(f"\n✅ Vorhersage gespeichert: {path}")
 print(df[df["position"] <= 3].sort_values(by="probability", ascending=False).head(10))
@@ -1,16 +1,43 @@
 import numpy as np
 import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.calibration import CalibratedClassifierCV
-from sklearn.isotonic import IsotonicRegression
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import cross_val_score
-from sklearn.metrics import brier_score_loss, log_loss
 import pickle
+import joblib
 import os
 from typing import Tuple, Dict, Any
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# scikit-learn >= 1.6 ersetzt cv='prefit' durch FrozenEstimator
+try:
+    from sklearn.frozen import FrozenEstimator
+    FROZEN_AVAILABLE = True
+except ImportError:
+    FROZEN_AVAILABLE = False
+
+# Eigene Methodennamen -> scikit-learn
+CALIBRATION_METHODS = {'platt': 'sigmoid', 'isotonic': 'isotonic'}
+
+class _PrecomputedProba(ClassifierMixin, BaseEstimator):
+    """
+    Platzhalter-Klassifikator: X sind bereits Wahrscheinlichkeiten (samples x positions)
+    und werden unverändert als predict_proba zurückgegeben.
+    """
+    
+    def __init__(self, classes=None):
+        self.classes = classes
+    
+    def fit(self, X, y=None):
+        self.classes_ = np.asarray(self.classes)
+        return self
+    
+    def predict_proba(self, X):
+        return np.asarray(X)
+    
+    def predict(self, X):
+        return self.classes_[np.argmax(X, axis=1)]
+
 class F1ProbabilityCalibrator:
     """
     Klasse zur Kalibrierung von F1-Platzierungswahrscheinlichkeiten.
@@ -23,7 +50,8 @@ class F1ProbabilityCalibrator:
             method: 'platt' für Platt Scaling oder 'isotonic' für Isotonic Regression
         """
         self.method = method
-        self.calibrators = {}  # Ein Kalibrator pro Position
+        self.calibrated_model = None  # One-vs-Rest-Kalibrierung aller Positionen
+        self.position_mask = None
         self.is_fitted = False
         
     def fit(self, y_true: np.ndarray, y_prob: np.ndarray, positions: np.ndarray):
@@ -35,26 +63,33 @@ class F1ProbabilityCalibrator:
             y_prob: Vorhergesagte Wahrscheinlichkeiten (2D array: samples x positions)
             positions: Array der Positionen (z.B. [1, 2, 3, ..., 20])
         """
+        if self.method not in CALIBRATION_METHODS:
+            raise ValueError(f"Unbekannte Methode: {self.method}")
+        
         print(f"🔧 Trainiere {self.method.upper()} Kalibratoren...")
         
-        for i, pos in enumerate(positions):
-            # Binäre Labels: 1 wenn Fahrer auf Position pos, 0 sonst
-            y_binary = (y_true == pos).astype(int)
-            y_prob_pos = y_prob[:, i]
-            
-            if self.method == 'platt':
-                # Platt Scaling (Logistische Regression)
-                calibrator = LogisticRegression()
-                calibrator.fit(y_prob_pos.reshape(-1, 1), y_binary)
-            elif self.method == 'isotonic':
-                # Isotonic Regression
-                calibrator = IsotonicRegression(out_of_bounds='clip')
-                calibrator.fit(y_prob_pos, y_binary)
-            else:
-                raise ValueError(f"Unbekannte Methode: {self.method}")
-            
-            self.calibrators[pos] = calibrator
-            
+        # CalibratedClassifierCV kalibriert alle Positionen One-vs-Rest in einem Aufruf;
+        # das "Basismodell" reicht die bereits berechneten Wahrscheinlichkeiten nur durch.
+        # Nur tatsächlich beobachtete Positionen werden kalibriert, der Rest bleibt 0.
+        self.position_mask = np.isin(positions, y_true)
+        observed = np.asarray(positions)[self.position_mask]
+        rows = np.isin(y_true, observed)
+        X_obs, y_obs = y_prob[rows][:, self.position_mask], y_true[rows]
+        
+        base = _PrecomputedProba(classes=observed).fit(X_obs)
+        sk_method = CALIBRATION_METHODS[self.method]
+        if FROZEN_AVAILABLE:
+            # ensemble=False: ein Kalibrator auf allen Zeilen (wie cv='prefit'). Ein einziger
+            # "Fold" über alle Zeilen, da das eingefrorene Modell ohnehin nicht neu trainiert wird
+            # und eine Stratifizierung bei seltenen Positionen nur warnen oder abbrechen würde.
+            all_rows = np.arange(len(y_obs))
+            self.calibrated_model = CalibratedClassifierCV(
+                FrozenEstimator(base), method=sk_method, ensemble=False, cv=[(all_rows, all_rows)]
+            )
+        else:
+            self.calibrated_model = CalibratedClassifierCV(base, method=sk_method, cv='prefit')
+        self.calibrated_model.fit(X_obs, y_obs)
+        
         self.is_fitted = True
         print(f"✅ Kalibrierung für {len(positions)} Positionen abgeschlossen")
     
@@ -64,35 +99,22 @@ class F1ProbabilityCalibrator:
         
         Args:
             y_prob: Unkalibrierte Wahrscheinlichkeiten (2D array)
-            positions: Array der Positionen
+            positions: Array der Positionen (wie beim Training)
         
         Returns:
-            Kalibrierte Wahrscheinlichkeiten (2D array)
+            Kalibrierte Wahrscheinlichkeiten (2D array, pro Zeile normalisiert)
         """
         if not self.is_fitted:
             raise ValueError("Kalibrator muss erst trainiert werden")
         
-        calibrated_probs = np.zeros_like(y_prob)
-        
-        for i, pos in enumerate(positions):
-            if pos in self.calibrators:
-                calibrator = self.calibrators[pos]
-                
-                if self.method == 'platt':
-                    calibrated_probs[:, i] = calibrator.predict_proba(
-                        y_prob[:, i].reshape(-1, 1)
-                    )[:, 1]  # Wahrscheinlichkeit für Klasse 1
-                elif self.method == 'isotonic':
-                    calibrated_probs[:, i] = calibrator.predict(y_prob[:, i])
-            else:
-                # Falls Position nicht trainiert, verwende ursprüngliche Wahrscheinlichkeit
-                calibrated_probs[:, i] = y_prob[:, i]
-        
-        # Normalisiere Wahrscheinlichkeiten pro Zeile (Fahrer)
-        row_sums = calibrated_probs.sum(axis=1, keepdims=True)
-        row_sums[row_sums == 0] = 1  # Vermeide Division durch 0
-        calibrated_probs = calibrated_probs / row_sums
+        # Alle Positionen kalibriert -> Ergebnis direkt übernehmen (bereits zeilennormalisiert)
+        if self.position_mask.all():
+            return self.calibrated_model.predict_proba(y_prob)
         
+        calibrated_probs = np.zeros_like(y_prob, dtype=float)
+        calibrated_probs[:, self.position_mask] = self.calibrated_model.predict_proba(
+            y_prob[:, self.position_mask]
+        )
         return calibrated_probs
     
     def save(self, filepath: str):
@@ -101,15 +123,13 @@ class F1ProbabilityCalibrator:
             raise ValueError("Kalibrator muss erst trainiert werden")
         
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'wb') as f:
-            pickle.dump(self, f)
+        joblib.dump(self, filepath, compress=3, protocol=pickle.HIGHEST_PROTOCOL)
         print(f"💾 Kalibrator gespeichert: {filepath}")
     
     @classmethod
     def load(cls, filepath: str):
         """Lädt einen gespeicherten Kalibrator."""
-        with open(filepath, 'rb') as f:
-            calibrator = pickle.load(f)
+        calibrator = joblib.load(filepath)
         print(f"📂 Kalibrator geladen: {filepath}")
         return calibrator
 
@@ -127,22 +147,20 @@ def evaluate_calibration(y_true: np.ndarray, y_prob_uncalibrated: np.ndarray,
     Returns:
         Dictionary mit Evaluationsmetriken
     """
-    results = {}
+    # One-Hot-Matrix der wahren Positionen; Brier Score = mittlerer quadratischer Fehler je Spalte
+    positions = np.asarray(positions)
+    Y = (y_true[:, None] == positions[None, :]).astype(np.float32)
+    brier_uncal = ((Y - y_prob_uncalibrated) ** 2).mean(axis=0)
+    brier_cal = ((Y - y_prob_calibrated) ** 2).mean(axis=0)
     
-    for i, pos in enumerate(positions):
-        y_binary = (y_true == pos).astype(int)
-        
-        # Brier Score (niedriger = besser)
-        brier_uncal = brier_score_loss(y_binary, y_prob_uncalibrated[:, i])
-        brier_cal = brier_score_loss(y_binary, y_prob_calibrated[:, i])
-        
-        results[f'brier_uncalibrated_P{pos}'] = brier_uncal
-        results[f'brier_calibrated_P{pos}'] = brier_cal
-        results[f'brier_improvement_P{pos}'] = brier_uncal - brier_cal
+    results = {}
+    for pos, uncal, cal in zip(positions, brier_uncal, brier_cal):
+        results[f'brier_uncalibrated_P{pos}'] = float(uncal)
+        results[f'brier_calibrated_P{pos}'] = float(cal)
+        results[f'brier_improvement_P{pos}'] = float(uncal - cal)
     
     # Durchschnittliche Verbesserung
-    improvements = [v for k, v in results.items() if 'improvement' in k]
-    results['avg_brier_improvement'] = np.mean(improvements)
+    results['avg_brier_improvement'] = float((brier_uncal - brier_cal).mean())
     
     return results
 
@@ -165,8 +183,7 @@ def calibrate_f1_model(model_path: str, training_data_path: str,
     print(f"🏎️ Starte F1-Modell-Kalibrierung mit {method.upper()}...")
     
     # Lade Modell
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
+    model = joblib.load(model_path)
     print(f"📂 Modell geladen: {model_path}")
     
     # Lade Trainingsdaten
@@ -175,13 +192,22 @@ def calibrate_f1_model(model_path: str, training_data_path: str,
     
     # Bereite Daten vor
     feature_cols = [col for col in df.columns if col not in ['final_position', 'driver', 'race', 'year']]
-    X = df[feature_cols].values
+    # float32 reicht für F1-Daten und halbiert den Speicherverkehr (RF rechnet intern ohnehin float32)
+    X = df[feature_cols].values.astype(np.float32, copy=False)
     y = df['final_position'].values
     
     # Split für Kalibrierung
     from sklearn.model_selection import train_test_split
+    # Seltene Platzierungen (<5 Samples) nur für die Stratifizierung in einen
+    # gemeinsamen "Tail"-Bucket legen, sonst bricht der Split bei Einzelfällen ab
+    _, inverse, counts = np.unique(y, return_inverse=True, return_counts=True)
+    rare = counts[inverse] < 5
+    y_strat = np.where(rare, -1, y)
+    if rare.sum() == 1:
+        # Ein einzelner Tail-Eintrag lässt sich nicht stratifizieren -> zur häufigsten Klasse
+        y_strat[rare] = y[np.argmax(counts[inverse])]
     X_train, X_cal, y_train, y_cal = train_test_split(
-        X, y, test_size=test_size, random_state=42, stratify=y
+        X, y, test_size=test_size, random_state=42, stratify=y_strat
     )
     
     print(f"📊 Kalibrierungsdaten: {X_cal.shape[0]} Samples")
@@ -189,28 +215,22 @@ def calibrate_f1_model(model_path: str, training_data_path: str,
     # Generiere Vorhersagen für Kalibrierung
     positions = np.arange(1, 21)  # P1 bis P20
     
-    # Vorhersage-Wahrscheinlichkeiten für alle Positionen
-    y_prob_uncalibrated = []
+    # Ein Multiklassen-Wald liefert alle Positions-Wahrscheinlichkeiten auf einmal
+    from sklearn.ensemble import RandomForestClassifier
+    clf = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
+    clf.fit(X_train, y_train)
+    # Fit parallel, die Vorhersage auf dem kleinen Kalibrierungs-Split ohne Thread-Pool
+    clf.set_params(n_jobs=1)
+    proba = clf.predict_proba(X_cal)
     
-    for pos in positions:
-        # Erstelle binäre Labels für jede Position
-        y_binary = (y_train == pos).astype(int)
-        
-        # Trainiere binären Klassifikator für diese Position
-        from sklearn.ensemble import RandomForestClassifier
-        pos_classifier = RandomForestClassifier(n_estimators=100, random_state=42)
-        pos_classifier.fit(X_train, y_binary)
-        
-        # Vorhersage für Kalibrierungsdaten
-        prob_pos = pos_classifier.predict_proba(X_cal)[:, 1]
-        y_prob_uncalibrated.append(prob_pos)
-    
-    y_prob_uncalibrated = np.column_stack(y_prob_uncalibrated)
+    # Auf feste Spalten P1..P20 abbilden; im Training fehlende Positionen bleiben 0
+    y_prob_uncalibrated = np.zeros((X_cal.shape[0], len(positions)), dtype=np.float32)
+    known = np.isin(clf.classes_, positions)
+    y_prob_uncalibrated[:, np.searchsorted(positions, clf.classes_[known])] = proba[:, known]
     
     # Normalisiere Wahrscheinlichkeiten
     row_sums = y_prob_uncalibrated.sum(axis=1, keepdims=True)
-    row_sums[row_sums == 0] = 1
-    y_prob_uncalibrated = y_prob_uncalibrated / row_sums
+    np.divide(y_prob_uncalibrated, row_sums, out=y_prob_uncalibrated, where=row_sums > 0)
     
     # Trainiere Kalibrator
     calibrator = F1ProbabilityCalibrator(method=method)
@@ -231,6 +251,24 @@ def calibrate_f1_model(model_path: str, training_data_path: str,
     
     return model, calibrator
 
+def _reliability_curve(probs: np.ndarray, y_binary: np.ndarray,
+                       bin_boundaries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mittlere Konfidenz und Trefferquote je Bin (lower, upper] für ein Reliability Diagram.
+    Leere Bins werden ausgelassen.
+    """
+    n_bins = len(bin_boundaries) - 1
+    bin_idx = np.digitize(probs, bin_boundaries, right=True) - 1
+    valid = (bin_idx >= 0) & (bin_idx < n_bins)
+    bin_idx = bin_idx[valid]
+    
+    counts = np.bincount(bin_idx, minlength=n_bins)
+    acc_sum = np.bincount(bin_idx, weights=y_binary[valid], minlength=n_bins)
+    conf_sum = np.bincount(bin_idx, weights=probs[valid], minlength=n_bins)
+    
+    filled = counts > 0
+    return conf_sum[filled] / counts[filled], acc_sum[filled] / counts[filled]
+
 def create_calibration_plots(y_true: np.ndarray, y_prob_uncalibrated: np.ndarray,
                            y_prob_calibrated: np.ndarray, positions: list,
                            output_dir: str = "data/processed/calibration_plots"):
@@ -246,77 +284,53 @@ def create_calibration_plots(y_true: np.ndarray, y_prob_uncalibrated: np.ndarray
     """
     os.makedirs(output_dir, exist_ok=True)
     
+    positions = [pos for pos in positions if pos <= y_prob_uncalibrated.shape[1]]
+    if not positions:
+        return
+    
+    # Binning für Reliability Diagram
+    n_bins = 10
+    bin_boundaries = np.linspace(0, 1, n_bins + 1)
+    
+    # Eine Figure für alle Positionen wiederverwenden, pro Position geleert und gespeichert
+    fig, (ax_r, ax_h) = plt.subplots(1, 2, figsize=(12, 5))
+    
     for pos in positions:
-        if pos > y_prob_uncalibrated.shape[1]:
-            continue
-            
+        ax_r.clear()
+        ax_h.clear()
         y_binary = (y_true == pos).astype(int)
         
-        plt.figure(figsize=(12, 5))
-        
         # Reliability Diagram
-        plt.subplot(1, 2, 1)
-        
-        # Binning für Reliability Diagram
-        n_bins = 10
-        bin_boundaries = np.linspace(0, 1, n_bins + 1)
-        bin_lowers = bin_boundaries[:-1]
-        bin_uppers = bin_boundaries[1:]
-        
-        # Unkalibriert
-        bin_centers_uncal = []
-        bin_accuracies_uncal = []
-        
-        for bin_lower, bin_upper in zip(bin_lowers, bin_uppers):
-            in_bin = (y_prob_uncalibrated[:, pos-1] > bin_lower) & (y_prob_uncalibrated[:, pos-1] <= bin_upper)
-            prop_in_bin = in_bin.mean()
-            
-            if prop_in_bin > 0:
-                accuracy_in_bin = y_binary[in_bin].mean()
-                avg_confidence_in_bin = y_prob_uncalibrated[in_bin, pos-1].mean()
-                
-                bin_centers_uncal.append(avg_confidence_in_bin)
-                bin_accuracies_uncal.append(accuracy_in_bin)
-        
-        # Kalibriert
-        bin_centers_cal = []
-        bin_accuracies_cal = []
-        
-        for bin_lower, bin_upper in zip(bin_lowers, bin_uppers):
-            in_bin = (y_prob_calibrated[:, pos-1] > bin_lower) & (y_prob_calibrated[:, pos-1] <= bin_upper)
-            prop_in_bin = in_bin.mean()
-            
-            if prop_in_bin > 0:
-                accuracy_in_bin = y_binary[in_bin].mean()
-                avg_confidence_in_bin = y_prob_calibrated[in_bin, pos-1].mean()
-                
-                bin_centers_cal.append(avg_confidence_in_bin)
-                bin_accuracies_cal.append(accuracy_in_bin)
+        bin_centers_uncal, bin_accuracies_uncal = _reliability_curve(
+            y_prob_uncalibrated[:, pos-1], y_binary, bin_boundaries
+        )
+        bin_centers_cal, bin_accuracies_cal = _reliability_curve(
+            y_prob_calibrated[:, pos-1], y_binary, bin_boundaries
+        )
         
-        # Plot
-        plt.plot([0, 1], [0, 1], 'k--', label='Perfekt kalibriert')
-        plt.plot(bin_centers_uncal, bin_accuracies_uncal, 'ro-', label='Unkalibriert')
-        plt.plot(bin_centers_cal, bin_accuracies_cal, 'bo-', label='Kalibriert')
+        ax_r.plot([0, 1], [0, 1], 'k--', label='Perfekt kalibriert')
+        ax_r.plot(bin_centers_uncal, bin_accuracies_uncal, 'ro-', label='Unkalibriert')
+        ax_r.plot(bin_centers_cal, bin_accuracies_cal, 'bo-', label='Kalibriert')
         
-        plt.xlabel('Mittlere vorhergesagte Wahrscheinlichkeit')
-        plt.ylabel('Anteil positiver Fälle')
-        plt.title(f'Reliability Diagram - Position {pos}')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
+        ax_r.set_xlabel('Mittlere vorhergesagte Wahrscheinlichkeit')
+        ax_r.set_ylabel('Anteil positiver Fälle')
+        ax_r.set_title(f'Reliability Diagram - Position {pos}')
+        ax_r.legend()
+        ax_r.grid(True, alpha=0.3)
         
         # Histogramm der Wahrscheinlichkeiten
-        plt.subplot(1, 2, 2)
-        plt.hist(y_prob_uncalibrated[:, pos-1], bins=20, alpha=0.5, label='Unkalibriert', density=True)
-        plt.hist(y_prob_calibrated[:, pos-1], bins=20, alpha=0.5, label='Kalibriert', density=True)
-        plt.xlabel('Wahrscheinlichkeit')
-        plt.ylabel('Dichte')
-        plt.title(f'Wahrscheinlichkeits-Verteilung - Position {pos}')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
+        ax_h.hist(y_prob_uncalibrated[:, pos-1], bins=20, alpha=0.5, label='Unkalibriert', density=True)
+        ax_h.hist(y_prob_calibrated[:, pos-1], bins=20, alpha=0.5, label='Kalibriert', density=True)
+        ax_h.set_xlabel('Wahrscheinlichkeit')
+        ax_h.set_ylabel('Dichte')
+        ax_h.set_title(f'Wahrscheinlichkeits-Verteilung - Position {pos}')
+        ax_h.legend()
+        ax_h.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(f"{output_dir}/calibration_P{pos}.png", dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(f"{output_dir}/calibration_P{pos}.png", dpi=300, bbox_inches='tight')
+    
+    plt.close(fig)
     
     print(f"📊 Kalibrierungs-Plots gespeichert in: {output_dir}")
 
@@ -1,20 +1,37 @@
 import os
+import sys
 import pandas as pd
 import subprocess
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Im selben Prozess ausführen: spart zwei Interpreter-Starts samt pandas/sklearn/fastf1-Import
+try:
+    from ml.generate_full_training_data import main as generate_full_training_data
+    from ml.train_model_full import main as train_model_full
+    IN_PROCESS_AVAILABLE = True
+except ModuleNotFoundError as e:
+    # Nur wenn die Skripte selbst nicht als Paket importierbar sind -> Fallback auf Subprozess;
+    # fehlende Abhängigkeiten (pandas, fastf1, ...) sollen weiterhin sichtbar fehlschlagen
+    if e.name not in ("ml", "ml.generate_full_training_data", "ml.train_model_full"):
+        raise
+    IN_PROCESS_AVAILABLE = False
+
 # Pfade
-DATA_PATH = "data/full_training_data.csv"
+DATA_PATH = "data/full/full_training_data.csv"
 RAW_DATA_DIR = "data/raw/"
 MODEL_PATH = "models/rf_model_full.pkl"
 
 def get_races_in_dataset():
     if not os.path.exists(DATA_PATH):
         return set()
-    df = pd.read_csv(DATA_PATH)
-    return set(df['EventName'].dropna().unique())
+    # Nur die Rennspalte lesen statt des kompletten Trainingsdatensatzes
+    races = pd.read_csv(DATA_PATH, usecols=["race"], dtype={"race": "category"})["race"]
+    return set(races.cat.categories)
 
 def get_races_in_raw_data():
-    return set(f.replace(".csv", "") for f in os.listdir(RAW_DATA_DIR) if f.endswith(".csv"))
+    with os.scandir(RAW_DATA_DIR) as entries:
+        return {e.name[:-len(".csv")] for e in entries if e.is_file() and e.name.endswith(".csv")}
 
 if __name__ == "__main__":
     dataset_races = get_races_in_dataset()
@@ -25,9 +42,15 @@ if __name__ == "__main__":
     if missing_races:
         print("🆕 Neue Rennen erkannt:", missing_races)
         print("🔄 Starte Datengenerierung...")
-        subprocess.run(["python", "ml/generate_full_training_data.py"])
+        if IN_PROCESS_AVAILABLE:
+            generate_full_training_data()
+        else:
+            subprocess.run([sys.executable, "ml/generate_full_training_data.py"])
         print("🧠 Starte Modelltraining...")
-        subprocess.run(["python", "ml/train_model_full.py"])
+        if IN_PROCESS_AVAILABLE:
+            train_model_full()
+        else:
+            subprocess.run([sys.executable, "ml/train_model_full.py"])
         print("✅ Fertig! Modell ist aktualisiert.")
     else:
         print("✅ Kein neues Rennen gefunden – nichts zu tun.")
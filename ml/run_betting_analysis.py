@@ -7,85 +7,72 @@ Simple command-line interface for running betting simulations and automated eval
 import argparse
 import os
 import sys
-import pandas as pd
 from datetime import datetime
-from bet_simulator import run_bet_simulation, F1BetSimulator
-from auto_race_evaluator import AutoRaceEvaluator
+from functools import lru_cache
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.paths import ensure_dir
 
 def create_sample_data():
     """
     Create sample betting recommendations and race results for testing
     """
+    import pandas as pd
+    
     print("📝 Creating sample data for testing...")
     
+    # Same five drivers per race in both files; race names interned as a Categorical
+    race_names = pd.Categorical(np.repeat(
+        np.array(['Bahrain GP', 'Saudi Arabia GP', 'Australia GP', 'Japan GP', 'China GP']), 5
+    ))
+    drivers = np.array([
+        'Max Verstappen', 'Lewis Hamilton', 'Charles Leclerc', 'Lando Norris', 'George Russell',
+        'Max Verstappen', 'Charles Leclerc', 'Lewis Hamilton', 'Carlos Sainz', 'Lando Norris',
+        'Max Verstappen', 'Lewis Hamilton', 'George Russell', 'Fernando Alonso', 'Charles Leclerc',
+        'Max Verstappen', 'Lando Norris', 'Charles Leclerc', 'Lewis Hamilton', 'Oscar Piastri',
+        'Max Verstappen', 'Lewis Hamilton', 'Charles Leclerc', 'George Russell', 'Carlos Sainz'
+    ], dtype=object)
+    
     # Sample betting recommendations
     betting_data = {
-        'Driver': [
-            'Max Verstappen', 'Lewis Hamilton', 'Charles Leclerc', 'Lando Norris', 'George Russell',
-            'Max Verstappen', 'Charles Leclerc', 'Lewis Hamilton', 'Carlos Sainz', 'Lando Norris',
-            'Max Verstappen', 'Lewis Hamilton', 'George Russell', 'Fernando Alonso', 'Charles Leclerc',
-            'Max Verstappen', 'Lando Norris', 'Charles Leclerc', 'Lewis Hamilton', 'Oscar Piastri',
-            'Max Verstappen', 'Lewis Hamilton', 'Charles Leclerc', 'George Russell', 'Carlos Sainz'
-        ],
-        'Quote': [
+        'Driver': drivers,
+        'Quote': np.array([
             1.8, 4.2, 5.5, 8.0, 12.0,
             1.6, 4.8, 5.2, 9.5, 7.5,
             1.9, 3.8, 11.0, 15.0, 6.2,
             1.7, 6.5, 5.8, 4.5, 18.0,
             1.5, 4.0, 6.0, 10.5, 8.8
-        ],
-        'Predicted_Probability': [
+        ], dtype=np.float32),
+        'Predicted_Probability': np.array([
             0.55, 0.24, 0.18, 0.12, 0.08,
             0.62, 0.21, 0.19, 0.11, 0.13,
             0.53, 0.26, 0.09, 0.07, 0.16,
             0.59, 0.15, 0.17, 0.22, 0.06,
             0.67, 0.25, 0.17, 0.10, 0.11
-        ],
-        'EV': [
+        ], dtype=np.float32),
+        'EV': np.array([
             3.2, 2.1, 1.8, 0.9, 0.5,
             2.8, 2.4, 1.9, 1.2, 0.8,
             3.1, 1.7, 0.6, 0.4, 1.1,
             2.9, 1.3, 1.4, 1.8, 0.3,
             3.5, 2.2, 1.6, 0.7, 0.9
-        ],
-        'Race_Name': [
-            'Bahrain GP', 'Bahrain GP', 'Bahrain GP', 'Bahrain GP', 'Bahrain GP',
-            'Saudi Arabia GP', 'Saudi Arabia GP', 'Saudi Arabia GP', 'Saudi Arabia GP', 'Saudi Arabia GP',
-            'Australia GP', 'Australia GP', 'Australia GP', 'Australia GP', 'Australia GP',
-            'Japan GP', 'Japan GP', 'Japan GP', 'Japan GP', 'Japan GP',
-            'China GP', 'China GP', 'China GP', 'China GP', 'China GP'
-        ]
+        ], dtype=np.float32),
+        'Race_Name': race_names
     }
     
-    # Sample race results
+    # Sample race results: positions 1-5 in every race
     results_data = {
-        'Driver': [
-            'Max Verstappen', 'Lewis Hamilton', 'Charles Leclerc', 'Lando Norris', 'George Russell',
-            'Max Verstappen', 'Charles Leclerc', 'Lewis Hamilton', 'Carlos Sainz', 'Lando Norris',
-            'Max Verstappen', 'Lewis Hamilton', 'George Russell', 'Fernando Alonso', 'Charles Leclerc',
-            'Max Verstappen', 'Lando Norris', 'Charles Leclerc', 'Lewis Hamilton', 'Oscar Piastri',
-            'Max Verstappen', 'Lewis Hamilton', 'Charles Leclerc', 'George Russell', 'Carlos Sainz'
-        ],
-        'Actual_Position': [
-            1, 2, 3, 4, 5,
-            1, 2, 3, 4, 5,
-            1, 2, 3, 4, 5,
-            1, 2, 3, 4, 5,
-            1, 2, 3, 4, 5
-        ],
-        'Race_Name': [
-            'Bahrain GP', 'Bahrain GP', 'Bahrain GP', 'Bahrain GP', 'Bahrain GP',
-            'Saudi Arabia GP', 'Saudi Arabia GP', 'Saudi Arabia GP', 'Saudi Arabia GP', 'Saudi Arabia GP',
-            'Australia GP', 'Australia GP', 'Australia GP', 'Australia GP', 'Australia GP',
-            'Japan GP', 'Japan GP', 'Japan GP', 'Japan GP', 'Japan GP',
-            'China GP', 'China GP', 'China GP', 'China GP', 'China GP'
-        ]
+        'Driver': drivers,
+        'Actual_Position': np.tile(np.arange(1, 6, dtype=np.int8), 5),
+        'Race_Name': race_names
     }
     
     # Create directories
-    os.makedirs('data/live', exist_ok=True)
-    os.makedirs('data/batch', exist_ok=True)
-    os.makedirs('data/processed', exist_ok=True)
+    ensure_dir('data/live')
+    ensure_dir('data/batch')
+    ensure_dir('data/processed')
     
     # Save sample data
     betting_df = pd.DataFrame(betting_data)
@@ -130,6 +117,9 @@ def run_simulation_command(args):
     
     # Run simulation
     try:
+        # Import only when needed: pulls in pandas, matplotlib and seaborn
+        from bet_simulator import run_bet_simulation
+        
         simulator, performance = run_bet_simulation(
             betting_file, 
             results_file, 
@@ -149,6 +139,9 @@ def run_auto_evaluator_command(args):
     print("🤖 Starting Auto Race Evaluator...\n")
     
     try:
+        # Import only when needed
+        from auto_race_evaluator import AutoRaceEvaluator
+        
         evaluator = AutoRaceEvaluator(args.config)
         
         if args.mode == 'single':
@@ -178,7 +171,7 @@ def setup_auto_evaluator_command(args):
     ]
     
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        ensure_dir(directory)
         print(f"📁 Created directory: {directory}")
     
     # Create sample betting recommendations if they don't exist
@@ -187,6 +180,7 @@ def setup_auto_evaluator_command(args):
         create_sample_data()
     
     # Create a sample incoming race result file
+    import pandas as pd
     sample_result = pd.DataFrame({
         'Driver': ['Max Verstappen', 'Lewis Hamilton', 'Charles Leclerc', 'Lando Norris', 'George Russell'],
         'Actual_Position': [1, 2, 3, 4, 5],
@@ -228,6 +222,36 @@ def setup_auto_evaluator_command(args):
     print("2. Run: python run_betting_analysis.py auto --mode single")
     print("3. Or run continuous monitoring: python run_betting_analysis.py auto --mode continuous")
 
+@lru_cache(maxsize=32)
+def _summarize_simulation_log_cached(path, mtime_ns, size):
+    import pandas as pd
+    
+    # Only the three summary columns, folded chunk by chunk so memory
+    # stays bounded however large the log grows
+    total_profit = 0.0
+    total_bets = 0
+    wins = 0
+    race_names = set()
+    for chunk in pd.read_csv(
+        path,
+        usecols=['Profit_Loss', 'Outcome', 'Race_Name'],
+        dtype={'Profit_Loss': 'float32', 'Outcome': 'category', 'Race_Name': 'category'},
+        chunksize=200_000
+    ):
+        total_profit += float(chunk['Profit_Loss'].to_numpy().sum(dtype='float64'))
+        total_bets += len(chunk)
+        wins += int((chunk['Outcome'] == 'WIN').sum())
+        race_names.update(chunk['Race_Name'].dropna().unique())
+    return total_profit, total_bets, wins, len(race_names)
+
+def summarize_simulation_log(path):
+    """
+    Return (total_profit, total_bets, wins, races) for a simulation log.
+    Keyed on mtime and size, so an unchanged log is never parsed twice
+    """
+    stat = os.stat(path)
+    return _summarize_simulation_log_cached(path, stat.st_mtime_ns, stat.st_size)
+
 def status_command(args):
     """
     Show status of betting analysis system
@@ -251,7 +275,11 @@ def status_command(args):
                 modified = datetime.fromtimestamp(os.path.getmtime(path))
                 print(f"✅ {name}: {path} ({size} bytes, modified: {modified.strftime('%Y-%m-%d %H:%M')})")
             else:
-                files_count = len(os.listdir(path)) if os.path.isdir(path) else 0
+                if os.path.isdir(path):
+                    with os.scandir(path) as it:
+                        files_count = sum(1 for _ in it)
+                else:
+                    files_count = 0
                 print(f"✅ {name}: {path} ({files_count} files)")
         else:
             print(f"❌ {name}: {path} (not found)")
@@ -260,11 +288,8 @@ def status_command(args):
     log_file = 'data/processed/bet_simulation_log.csv'
     if os.path.exists(log_file):
         try:
-            log_df = pd.read_csv(log_file)
-            total_profit = log_df['Profit_Loss'].sum()
-            total_bets = len(log_df)
-            win_rate = len(log_df[log_df['Outcome'] == 'WIN']) / total_bets * 100
-            races = log_df['Race_Name'].nunique()
+            total_profit, total_bets, wins, races = summarize_simulation_log(log_file)
+            win_rate = wins / total_bets * 100
             
             print(f"\n💰 Simulation Summary:")
             print(f"   Total Races: {races}")
@@ -278,7 +303,8 @@ def status_command(args):
     # Check for pending race results
     incoming_dir = 'data/incoming_results'
     if os.path.exists(incoming_dir):
-        pending_files = [f for f in os.listdir(incoming_dir) if f.endswith('.csv')]
+        with os.scandir(incoming_dir) as it:
+            pending_files = [e.name for e in it if e.is_file() and e.name.endswith('.csv')]
         if pending_files:
             print(f"\n⏳ Pending Race Results ({len(pending_files)} files):")
             for file in pending_files[:5]:  # Show first 5
@@ -385,8 +411,8 @@ Examples:
                     }
                 }
                 
-                os.makedirs('config', exist_ok=True)
-                os.makedirs('data/cache', exist_ok=True)
+                ensure_dir('config')
+                ensure_dir('data/cache')
                 with open(args.config, 'w') as f:
                     import json
                     json.dump(config, f, indent=2)
@@ -4,9 +4,14 @@ Simple dashboard updater that updates race information without complex dependenc
 """
 
 import os
+import sys
+import csv
 import json
-import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.paths import ensure_dir
 
 def load_race_schedule():
     """Load the race schedule"""
@@ -16,26 +21,42 @@ def load_race_schedule():
             return json.load(f)
     return []
 
+def write_json(data, path):
+    """Write data as compact JSON (read by the dashboard, not by people)"""
+    with open(path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+def write_rows(path, header, rows):
+    """Write a small fixed table as CSV without building a DataFrame"""
+    ensure_dir(os.path.dirname(path))
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(rows)
+
 def get_next_race(races):
     """Get the next upcoming race"""
-    now = datetime.now()
-    upcoming_races = []
+    import pandas as pd
+    
+    if not races:
+        return None, None
     
-    for race in races:
-        if race['race_date']:
-            try:
-                race_time = datetime.fromisoformat(race['race_date'].replace('Z', '+00:00'))
-                # Make race_time timezone naive for comparison
-                race_time = race_time.replace(tzinfo=None)
-                if race_time > now:
-                    upcoming_races.append((race, race_time))
-            except Exception as e:
-                print(f"Error parsing date for {race['race_name']}: {e}")
+    # Parse the whole calendar in one pass; missing or invalid dates become NaT
+    race_times = pd.to_datetime(
+        [race.get('race_date') for race in races], utc=True, errors='coerce', format='ISO8601'
+    ).tz_convert(None)
     
-    if upcoming_races:
-        # Sort by date and return the next one
-        upcoming_races.sort(key=lambda x: x[1])
-        return upcoming_races[0][0], upcoming_races[0][1]
+    for race, race_time in zip(races, race_times):
+        if race.get('race_date') and pd.isna(race_time):
+            print(f"Error parsing date for {race['race_name']}: {race['race_date']!r}")
+    
+    # Race dates are stored in UTC, so compare against the current UTC time
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None)
+    upcoming = (race_times > now).nonzero()[0]
+    if len(upcoming):
+        # Earliest upcoming race
+        i = upcoming[race_times[upcoming].argmin()]
+        return races[i], race_times[i].to_pydatetime()
     
     return None, None
 
@@ -49,7 +70,7 @@ def update_next_race_info():
             print("❌ No upcoming race found")
             return False
         
-        now = datetime.now()
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
         time_until_race = race_time - now
         
         race_info = {
@@ -70,9 +91,8 @@ def update_next_race_info():
         
         # Save race info
         info_file = "data/live/next_race_info.json"
-        os.makedirs(os.path.dirname(info_file), exist_ok=True)
-        with open(info_file, 'w') as f:
-            json.dump(race_info, f, indent=2)
+        ensure_dir(os.path.dirname(info_file))
+        write_json(race_info, info_file)
         
         # Create race countdown data
         countdown_data = {
@@ -87,8 +107,7 @@ def update_next_race_info():
         }
         
         countdown_file = "data/live/race_countdown.json"
-        with open(countdown_file, 'w') as f:
-            json.dump(countdown_data, f, indent=2)
+        write_json(countdown_data, countdown_file)
         
         print(f"✅ Updated race info: {race_info['race_name']}")
         print(f"   📍 {race_info['location']}, {race_info['country']}")
@@ -116,14 +135,15 @@ def create_sample_odds():
             {"driver": "Sergio Perez", "odds": 15.00, "bookmaker": "Paddy Power", "last_updated": "12:20"}
         ]
         
-        odds_df = pd.DataFrame(sample_odds)
-        odds_df['odds_formatted'] = odds_df['odds'].apply(lambda x: f"{x:.2f}")
-        
         odds_file = "data/live/best_odds_summary.csv"
-        os.makedirs(os.path.dirname(odds_file), exist_ok=True)
-        odds_df.to_csv(odds_file, index=False)
-        
-        print(f"✅ Created sample odds for {len(odds_df)} drivers")
+        write_rows(
+            odds_file,
+            ['driver', 'odds', 'bookmaker', 'last_updated', 'odds_formatted'],
+            [[o['driver'], o['odds'], o['bookmaker'], o['last_updated'], f"{o['odds']:.2f}"]
+             for o in sample_odds]
+        )
+        
+        print(f"✅ Created sample odds for {len(sample_odds)} drivers")
         return True
         
     except Exception as e:
@@ -161,17 +181,20 @@ def create_sample_value_bets():
             }
         ]
         
-        bets_df = pd.DataFrame(value_bets)
-        bets_df['ev_formatted'] = bets_df['expected_value'].apply(lambda x: f"{x:.3f}")
-        bets_df['odds_formatted'] = bets_df['odds'].apply(lambda x: f"{x:.2f}")
-        bets_df['probability_formatted'] = bets_df['probability_pct'].apply(lambda x: f"{x:.1f}%")
-        bets_df['potential_profit_formatted'] = bets_df['potential_profit'].apply(lambda x: f"€{x:.2f}")
-        
         bets_file = "data/live/top_value_bets.csv"
-        os.makedirs(os.path.dirname(bets_file), exist_ok=True)
-        bets_df.to_csv(bets_file, index=False)
-        
-        print(f"✅ Created {len(bets_df)} sample value bets")
+        write_rows(
+            bets_file,
+            ['driver', 'odds', 'probability_pct', 'expected_value', 'bet_recommendation',
+             'potential_profit', 'ev_formatted', 'odds_formatted', 'probability_formatted',
+             'potential_profit_formatted'],
+            [[b['driver'], b['odds'], b['probability_pct'], b['expected_value'],
+              b['bet_recommendation'], b['potential_profit'],
+              f"{b['expected_value']:.3f}", f"{b['odds']:.2f}",
+              f"{b['probability_pct']:.1f}%", f"€{b['potential_profit']:.2f}"]
+             for b in value_bets]
+        )
+        
+        print(f"✅ Created {len(value_bets)} sample value bets")
         return True
         
     except Exception as e:
@@ -1,40 +1,48 @@
+import numpy as np
 import pandas as pd
 
 # Daten laden
 YEAR = 2023
-pred = pd.read_csv(f"data/batch/predictions_{YEAR}.csv")
-results = pd.read_csv(f"data/batch/actual_results_{YEAR}.csv").rename(columns={"Driver": "driver"})
+# Kompakte dtypes: Kategorien für Schlüssel, schmale Zahlen für Platz/Wahrscheinlichkeit
+pred = pd.read_csv(
+    f"data/batch/predictions_{YEAR}.csv",
+    usecols=["year", "race", "driver", "position", "probability"],
+    dtype={"year": "int16", "race": "category", "driver": "category",
+           "position": "int8", "probability": "float32"}
+)
+results = pd.read_csv(
+    f"data/batch/actual_results_{YEAR}.csv",
+    usecols=["Driver", "final_position", "year", "race"],
+    dtype={"year": "int16"}
+).rename(columns={"Driver": "driver"})
 
-# 🔢 Fiktive Quoten für Platz 1–3
+# 🔢 Fiktive Quoten für Platz 1–3 (Index = Position, sonst 0)
 odds = {1: 5.0, 2: 6.0, 3: 8.0}
+odds_arr = np.zeros(max(odds) + 1)
+odds_arr[list(odds)] = list(odds.values())
 stake = 10  # Einsatz pro Wette
 
-# Nur höchste Wahrscheinlichkeit je Fahrer
-top_preds = (
-    pred.sort_values("probability", ascending=False)
-    .groupby(["year", "race", "driver"])
-    .first()
-    .reset_index()
-)
+# Nur höchste Wahrscheinlichkeit je Fahrer (idxmax statt Komplett-Sortierung)
+idx = pred.groupby(["year", "race", "driver"], observed=True, sort=False)["probability"].idxmax()
+top_preds = pred.loc[idx]
 
 # Mergen mit echten Ergebnissen
 merged = top_preds.merge(results, on=["year", "race", "driver"])
 
 # Nur Top-3-Platzierungen als Wetteinsatz
-bettable = merged[merged["position"] <= 3].copy()
-bettable["hit"] = (bettable["position"] == bettable["final_position"]).astype(int)
-bettable["odds"] = bettable["position"].map(odds)
-bettable["payout"] = bettable["hit"] * bettable["odds"] * stake
-bettable["cost"] = stake
+bettable = merged[merged["position"] <= 3]
+position = bettable["position"].to_numpy(dtype=np.int64)
+hit = (position == bettable["final_position"].to_numpy()).astype(np.int8)
+payout = hit * odds_arr[position] * stake
 
 # ROI berechnen
-total_invest = bettable["cost"].sum()
-total_return = bettable["payout"].sum()
+total_invest = stake * len(bettable)
+total_return = payout.sum()
 roi = (total_return - total_invest) / total_invest
 
 # Ausgabe
 print("\n💸 ROI-Simulation (Top-3 Platzwetten)")
-print(f"🎯 Treffer: {bettable['hit'].sum()} von {len(bettable)}")
+print(f"🎯 Treffer: {hit.sum()} von {len(bettable)}")
 print(f"💰 Total eingesetzt: {total_invest:.2f} €")
 print(f"💵 Total gewonnen: {total_return:.2f} €")
 print(f"📈 ROI: {roi*100:.2f} %")
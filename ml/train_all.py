@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import argparse
+import importlib
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(ML_DIR, "..")))
+sys.path.append(ML_DIR)
+
+# Reihenfolge wie beim manuellen Aufruf der Einzelskripte
+TRAINING_MODULES = {
+    "position": "train_model",
+    "position_classifier": "train_model_position_classifier",
+    "regression": "train_model_regression",
+    "top10": "train_model_top10",
+    "full": "train_model_full",
+}
+
+
+def train_all(models=tuple(TRAINING_MODULES)):
+    """
+    Trainiert die gewählten Modelle nacheinander im selben Prozess.
+
+    Ruft main() der einzelnen Trainingsskripte auf, die sich so den
+    Interpreter (pandas/sklearn nur einmal importiert) und den Datensatz
+    teilen: read_csv_cached lädt driver_feature_data.csv nur beim ersten Skript.
+
+    Die Fits laufen bewusst nacheinander: HistGradientBoosting nutzt per
+    OpenMP bereits alle Kerne, parallele Fits würden nur überbuchen und
+    gleichzeitig ins Performance-Log schreiben.
+    """
+    for name in models:
+        module = TRAINING_MODULES[name]
+        print(f"\n🧠 Training: {name} ({module}.py)")
+        start = time.perf_counter()
+        importlib.import_module(module).main()
+        print(f"⏱️ {name}: {time.perf_counter() - start:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alle F1-Modelle in einem Prozess trainieren")
+    parser.add_argument("--models", nargs="+", choices=list(TRAINING_MODULES),
+                        default=list(TRAINING_MODULES))
+    args = parser.parse_args(argv)
+    train_all(args.models)
+
+
+if __name__ == "__main__":
+    main()
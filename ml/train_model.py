@@ -1,18 +1,14 @@
-import pandas as pd
+import numpy as np
 import joblib
+import pickle
 import os
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
-
-# Daten laden
-df = pd.read_csv("data/processed/driver_feature_data.csv")
-
-# Zielvariable
-y = df["final_position"].astype(int)
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.performance_log import PERFORMANCE_LOG_PATH, append_performance_log
+from utils.csv_cache import read_csv_cached
 
 # Input-Features
-X = df[[
+FEATURES = [
     "fastest_lap",
     "avg_lap",
     "stints",
@@ -21,48 +17,60 @@ X = df[[
     "track_affinity",
     "team_strength",
     "momentum"
-]]
+]
+
+
+def main():
+    # sklearn erst beim Training importieren: Import des Moduls bleibt billig
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+
+    # Daten laden (nur Features + Ziel; geparste CSV kommt aus dem Pickle-Cache)
+    df = read_csv_cached("data/processed/driver_feature_data.csv", FEATURES + ["final_position"])
+
+    # Zielvariable
+    y = df["final_position"].astype(np.int8)  # Plätze 1–20
+
+    # Feature-Matrix
+    X = df[FEATURES].astype(np.float32)  # Histogramm-Binning braucht kein float64
 
+    # Train-Test-Split
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
 
-# Train-Test-Split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
+    # Modell: Histogramm-Boosting (255 Bins pro Feature, OpenMP-parallel)
+    model = HistGradientBoostingClassifier(
+        max_iter=200, max_bins=255, early_stopping=True, random_state=42
+    )
+    model.fit(X_train, y_train)
 
-# Modell
-model = RandomForestClassifier(n_estimators=200, random_state=42)
-model.fit(X_train, y_train)
+    # Prediction & Evaluation
+    y_pred = model.predict(X_test)
+    acc = accuracy_score(y_test, y_pred)
 
-# Prediction & Evaluation
-y_pred = model.predict(X_test)
-acc = accuracy_score(y_test, y_pred)
+    # Logging
+    log = {
+        "model": "HistGradientBoosting",
+        "accuracy": round(acc, 4),
+        "n_train": len(X_train),
+        "n_test": len(X_test)
+    }
 
-# Logging
-log = {
-    "model": "RandomForest",
-    "accuracy": round(acc, 4),
-    "n_train": len(X_train),
-    "n_test": len(X_test)
-}
+    # Ausgabe
+    print("✅ Modell trainiert")
+    print(f"📊 Accuracy: {log['accuracy']} on {log['n_test']} test samples")
 
-# Ausgabe
-print("✅ Modell trainiert")
-print(f"📊 Accuracy: {log['accuracy']} on {log['n_test']} test samples")
+    # Speichern
+    os.makedirs("models", exist_ok=True)
+    joblib.dump(model, "models/rf_model.pkl", compress=3, protocol=pickle.HIGHEST_PROTOCOL)  # zlib Stufe 3: kleine Datei, schnelles Laden
 
-# Speichern
-os.makedirs("models", exist_ok=True)
-joblib.dump(model, "models/rf_model.pkl")
+    # Log speichern
+    log_path = PERFORMANCE_LOG_PATH
+    log_id = append_performance_log(log, log_path)
+    print(f"🧠 Modell #{log_id} gespeichert & geloggt in {log_path}")
 
-# Log speichern
-log_path = "data/processed/model_performance_log.csv"
-os.makedirs("data/processed", exist_ok=True)
-if os.path.exists(log_path):
-    old = pd.read_csv(log_path)
-    log_id = len(old) + 1
-    df_log = pd.concat([old, pd.DataFrame([log])], ignore_index=True)
-else:
-    df_log = pd.DataFrame([log])
-    log_id = 1
 
-df_log.to_csv(log_path, index=False)
-print(f"🧠 Modell #{log_id} gespeichert & geloggt in {log_path}")
+if __name__ == "__main__":
+    main()
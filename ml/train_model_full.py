@@ -1,17 +1,14 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
 import joblib
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report
+import pickle
 
 # Import-Fix
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# 📥 Daten laden
 DATA_PATH = "data/full/full_training_data.csv"
-df = pd.read_csv(DATA_PATH)
 
 # 🧹 Features & Zielspalte
 features = [
@@ -22,27 +19,49 @@ features = [
 
 target = "position"
 
-# 🔁 Fehlende Werte entfernen
-df = df.dropna(subset=features + [target])
 
-# 🧪 Trainingssplit
-X = df[features]
-y = df[target].astype(int)
+def main():
+    # sklearn erst beim Training importieren: Import des Moduls bleibt billig
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import classification_report
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
+    # 📥 Daten laden (nur benötigte Spalten, feste dtypes statt Typ-Inferenz;
+    # float32 auch für Ziel/Flags, da sie vor dem dropna NaN enthalten können)
+    df = pd.read_csv(
+        DATA_PATH,
+        usecols=features + [target],
+        dtype=dict.fromkeys(features + [target], "float32")
+    )
 
-# 🧠 Modell trainieren
-model = RandomForestClassifier(n_estimators=200, max_depth=10, random_state=42)
-model.fit(X_train, y_train)
+    # 🔁 Fehlende Werte entfernen
+    df = df.dropna(subset=features + [target])
 
-# 📊 Auswertung
-y_pred = model.predict(X_test)
-print("\n📈 Modellbewertung (Testdaten):")
-print(classification_report(y_test, y_pred))
+    # 🧪 Trainingssplit
+    X = df[features]  # bereits float32 wie intern von sklearn verwendet
+    y = df[target].astype(np.int32)
 
-# 💾 Speichern
-os.makedirs("models", exist_ok=True)
-joblib.dump(model, "models/rf_model_full.pkl")
-print("\n✅ Modell gespeichert unter: models/rf_model_full.pkl")
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    # 🧠 Modell trainieren
+    # Histogramm-Boosting: Split-Suche über max. 255 Bins statt sortierter Rohwerte
+    model = HistGradientBoostingClassifier(
+        max_iter=200, max_depth=10, early_stopping=True, random_state=42
+    )
+    model.fit(X_train, y_train)
+
+    # 📊 Auswertung
+    y_pred = model.predict(X_test)
+    print("\n📈 Modellbewertung (Testdaten):")
+    print(classification_report(y_test, y_pred))
+
+    # 💾 Speichern
+    os.makedirs("models", exist_ok=True)
+    joblib.dump(model, "models/rf_model_full.pkl", compress=3, protocol=pickle.HIGHEST_PROTOCOL)
+    print("\n✅ Modell gespeichert unter: models/rf_model_full.pkl")
+
+
+if __name__ == "__main__":
+    main()
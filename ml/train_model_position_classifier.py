@@ -1,18 +1,14 @@
-import pandas as pd
+import numpy as np
 import joblib
+import pickle
 import os
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
+import sys
 
-# Daten laden
-df = pd.read_csv("data/processed/driver_feature_data.csv")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.csv_cache import read_csv_cached
 
-# Ziel: Platz (Integer 1–20) → Klassifikation
-y = df["final_position"].astype(int)
-
-# Features
-X = df[[
+# Input-Features
+FEATURES = [
     "fastest_lap",
     "avg_lap",
     "stints",
@@ -21,23 +17,47 @@ X = df[[
     "track_affinity",
     "team_strength",
     "momentum"
-]]
-
-# Split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# Modell
-model = RandomForestClassifier(n_estimators=300, max_depth=10, random_state=42)
-model.fit(X_train, y_train)
-
-# Evaluation
-y_pred = model.predict(X_test)
-acc = accuracy_score(y_test, y_pred)
-print(f"✅ Platz-Klassifizierungsmodell trainiert")
-print(f"🎯 Accuracy (exakter Platz): {round(acc, 4)}")
-
-# Speichern
-os.makedirs("models", exist_ok=True)
-joblib.dump(model, "models/rf_model_position_classifier.pkl")
+]
+
+
+def main():
+    # sklearn erst beim Training importieren: Import des Moduls bleibt billig
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+
+    # Daten laden (nur Features + Ziel; geparste CSV kommt aus dem Pickle-Cache)
+    df = read_csv_cached("data/processed/driver_feature_data.csv", FEATURES + ["final_position"])
+
+    # Ziel: Platz (Integer 1–20) → Klassifikation
+    y = df["final_position"].astype(np.int32)
+
+    # Features
+    X = df[FEATURES].astype(np.float32)  # Bäume rechnen intern mit float32: spart die Kopie in fit()
+
+    # Split (stratifiziert, solange jeder Platz mindestens zweimal vorkommt)
+    stratify = y if y.value_counts().min() >= 2 else None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=stratify
+    )
+
+    # Modell
+    # Histogramm-Boosting: gibt den GIL frei und teilt X über Threads statt Worker-Kopien
+    model = HistGradientBoostingClassifier(
+        max_iter=200, max_depth=10, early_stopping=True, random_state=42
+    )
+    model.fit(X_train, y_train)
+
+    # Evaluation
+    y_pred = model.predict(X_test)
+    acc = accuracy_score(y_test, y_pred)
+    print(f"✅ Platz-Klassifizierungsmodell trainiert")
+    print(f"🎯 Accuracy (exakter Platz): {round(acc, 4)}")
+
+    # Speichern
+    os.makedirs("models", exist_ok=True)
+    joblib.dump(model, "models/rf_model_position_classifier.pkl", compress=3, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,15 @@
 import os
-import pandas as pd
+import sys
+import numpy as np
 import joblib
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix
-)
-
-# Daten laden
-df = pd.read_csv("data/processed/driver_feature_data.csv")
-
-# Neue Zielvariable: Top-10 erreicht (1) oder nicht (0)
-df["top10"] = df["final_position"] <= 10
-y = df["top10"].astype(int)
-
-# Features
-X = df[[
+import pickle
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.performance_log import PERFORMANCE_LOG_PATH, append_performance_log
+from utils.csv_cache import read_csv_cached
+
+# Input-Features
+FEATURES = [
     "fastest_lap",
     "avg_lap",
     "stints",
@@ -26,49 +18,71 @@ X = df[[
     "track_affinity",
     "team_strength",
     "momentum"
-]]
-
-# Train/test split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# Modell
-model = RandomForestClassifier(n_estimators=200, max_depth=8, random_state=42)
-model.fit(X_train, y_train)
-
-# Prediction
-y_pred = model.predict(X_test)
-
-# Bewertung
-acc = accuracy_score(y_test, y_pred)
-print("✅ Binary Top-10-Modell trainiert")
-print(f"🎯 Accuracy: {round(acc, 4)} on {len(y_test)} test samples")
-
-print("\n🧠 Classification Report:")
-print(classification_report(y_test, y_pred, target_names=["Nicht Top-10", "Top-10"]))
-
-print("\n🧩 Confusion Matrix:")
-print(confusion_matrix(y_test, y_pred))
-
-# Modell speichern
-os.makedirs("models", exist_ok=True)
-joblib.dump(model, "models/rf_model_top10.pkl")
-
-# Logging
-log_path = "data/processed/model_performance_log.csv"
-log_entry = pd.DataFrame([{
-    "model": "RF-Top10",
-    "accuracy": round(acc, 4),
-    "n_train": len(X_train),
-    "n_test": len(X_test)
-}])
-
-if os.path.exists(log_path):
-    old = pd.read_csv(log_path)
-    log_df = pd.concat([old, log_entry], ignore_index=True)
-else:
-    log_df = log_entry
-
-log_df.to_csv(log_path, index=False)
-print(f"📁 Modell gespeichert & geloggt in {log_path}")
+]
+
+
+def main():
+    # sklearn erst beim Training importieren: Import des Moduls bleibt billig
+    from sklearn.model_selection import train_test_split
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.metrics import (
+        accuracy_score,
+        classification_report,
+        confusion_matrix
+    )
+
+    # Daten laden (nur Features + Ziel; geparste CSV kommt aus dem Pickle-Cache)
+    df = read_csv_cached("data/processed/driver_feature_data.csv", FEATURES + ["final_position"])
+
+    # Neue Zielvariable: Top-10 erreicht (1) oder nicht (0)
+    df["top10"] = df["final_position"] <= 10
+    y = df["top10"].astype(np.int32)
+
+    # Features
+    X = df[FEATURES].astype(np.float32)  # sklearn rechnet intern ohnehin mit float32
+
+    # Train/test split (stratifiziert: gleicher Top-10-Anteil in Train und Test)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    # Modell
+    # Histogramm-Boosting: Split-Suche über max. 255 Bins statt sortierter Rohwerte
+    model = HistGradientBoostingClassifier(
+        max_iter=200, max_depth=8, early_stopping=True, random_state=42
+    )
+    model.fit(X_train, y_train)
+
+    # Prediction
+    y_pred = model.predict(X_test)
+
+    # Bewertung
+    acc = accuracy_score(y_test, y_pred)
+    print("✅ Binary Top-10-Modell trainiert")
+    print(f"🎯 Accuracy: {round(acc, 4)} on {len(y_test)} test samples")
+
+    print("\n🧠 Classification Report:")
+    print(classification_report(y_test, y_pred, target_names=["Nicht Top-10", "Top-10"]))
+
+    print("\n🧩 Confusion Matrix:")
+    print(confusion_matrix(y_test, y_pred))
+
+    # Modell speichern
+    os.makedirs("models", exist_ok=True)
+    joblib.dump(model, "models/rf_model_top10.pkl", compress=3, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Logging
+    log_path = PERFORMANCE_LOG_PATH
+    log_entry = {
+        "model": "HGB-Top10",
+        "accuracy": round(acc, 4),
+        "n_train": len(X_train),
+        "n_test": len(X_test)
+    }
+
+    append_performance_log(log_entry, log_path)
+    print(f"📁 Modell gespeichert & geloggt in {log_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import os
 import json
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
 try:
     import fastf1
 except ImportError:
@@ -92,7 +93,7 @@ def get_current_f1_schedule():
                     "fp2": race['Session2Date'].isoformat() if pd.notna(race['Session2Date']) else None,
                     "fp3": race['Session3Date'].isoformat() if pd.notna(race['Session3Date']) else None
                 },
-                "round_number": race['RoundNumber']
+                "round_number": int(race['RoundNumber'])  # numpy int from FastF1 -> JSON-serializable
             }
             races.append(race_data)
         
@@ -104,26 +105,29 @@ def get_current_f1_schedule():
         print("Using fallback schedule...")
         return get_2025_f1_schedule_fallback()
 
-def get_next_race(races):
-    """Get the next upcoming race"""
-    now = datetime.now()
+@lru_cache(maxsize=None)
+def parse_race_date(race_date):
+    """Parse an ISO race date once; result is timezone naive for comparison"""
+    return datetime.fromisoformat(race_date.replace('Z', '+00:00')).replace(tzinfo=None)
+
+def get_next_race(races, now=None):
+    """Get the next upcoming race (relative to now, default: current local time)"""
+    if now is None:
+        now = datetime.now()
     upcoming_races = []
     
     for race in races:
         if race['race_date']:
             try:
-                race_time = datetime.fromisoformat(race['race_date'].replace('Z', '+00:00'))
-                # Make race_time timezone naive for comparison
-                race_time = race_time.replace(tzinfo=None)
+                race_time = parse_race_date(race['race_date'])
                 if race_time > now:
                     upcoming_races.append((race, race_time))
             except Exception as e:
                 print(f"Error parsing date for {race['race_name']}: {e}")
     
     if upcoming_races:
-        # Sort by date and return the next one
-        upcoming_races.sort(key=lambda x: x[1])
-        return upcoming_races[0][0], upcoming_races[0][1]
+        # Only the earliest race is needed: O(N) scan instead of a full sort
+        return min(upcoming_races, key=lambda x: x[1])
     
     return None, None
 
@@ -143,16 +147,26 @@ def main():
     schedule_file = "data/live/race_schedule.json"
     os.makedirs(os.path.dirname(schedule_file), exist_ok=True)
     
-    with open(schedule_file, 'w') as f:
-        json.dump(races, f, indent=2)
+    # Write to a temp file and swap it in so readers never see a partial schedule
+    tmp_file = f"{schedule_file}.tmp"
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump(races, f, indent=2)
+        os.replace(tmp_file, schedule_file)
+    except Exception:
+        # Don't leave a half-written temp file behind
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
     
     print(f"💾 Saved schedule to {schedule_file}")
     
-    # Show next race
-    next_race, race_time = get_next_race(races)
+    # Show next race (one clock reading for lookup and countdown)
+    now = datetime.now()
+    next_race, race_time = get_next_race(races, now)
     
     if next_race:
-        time_until = race_time - datetime.now()
+        time_until = race_time - now
         days = time_until.days
         hours = int(time_until.total_seconds() // 3600) % 24
         
@@ -35,30 +35,32 @@ def calculate_value_bets(probabilities_df: pd.DataFrame, odds_dict: Dict[str, fl
     Returns:
         DataFrame mit Value Bet Empfehlungen
     """
-    results = []
-    
-    for position in positions:
-        pos_data = probabilities_df[probabilities_df['position'] == position].copy()
-        
-        for _, row in pos_data.iterrows():
-            driver = row['driver']
-            probability = row['probability'] / 100.0  # Convert percentage to decimal
-            
-            if driver in odds_dict:
-                odds = odds_dict[driver]
-                ev = calculate_expected_value(probability, odds, stake)
-                
-                results.append({
-                    'driver': driver,
-                    'position': f'P{position}',
-                    'probability': row['probability'],
-                    'odds': odds,
-                    'stake': stake,
-                    'expected_value': round(ev, 2),
-                    'recommendation': 'BET' if ev > 0 else 'SKIP'
-                })
-    
-    return pd.DataFrame(results)
+    # Alle gewünschten Positionen auf einmal, Reihenfolge wie in `positions`
+    position_order = {pos: i for i, pos in enumerate(positions)}
+    pos_data = probabilities_df[probabilities_df['position'].isin(positions)]
+    pos_data = pos_data.iloc[
+        pos_data['position'].map(position_order).to_numpy().argsort(kind='stable')
+    ]
+    
+    # Quoten per Fahrer zuordnen, Fahrer ohne Quote entfallen
+    odds = pos_data['driver'].map(odds_dict)
+    has_odds = odds.notna().to_numpy()
+    pos_data = pos_data[has_odds]
+    o = odds.to_numpy(dtype=float)[has_odds]
+    p = pos_data['probability'].to_numpy(dtype=float) / 100.0  # Prozent -> Dezimal
+    
+    # EV wie calculate_expected_value, als eine Array-Operation
+    ev = (p * o - (1 - p)) * stake
+    
+    return pd.DataFrame({
+        'driver': pos_data['driver'].to_numpy(),
+        'position': 'P' + pos_data['position'].astype(int).astype(str).to_numpy(dtype=object),
+        'probability': pos_data['probability'].to_numpy(),
+        'odds': o,
+        'stake': stake,
+        'expected_value': np.round(ev, 2),
+        'recommendation': np.where(ev > 0, 'BET', 'SKIP')
+    })
 
 def analyze_value_bets_from_files(probabilities_file: str, odds_file: str, 
                                  output_file: str = "data/live/value_bets.csv") -> pd.DataFrame:
@@ -0,0 +1,17 @@
+import os
+import sys
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for path in (ROOT, os.path.join(ROOT, "ml")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Die Tests laden nie echte Sessions (get_session wird je Test ersetzt);
+# ohne installiertes FastF1 reicht ein Platzhalter für die Modul-Imports
+try:
+    import fastf1  # noqa: F401
+except ImportError:
+    fastf1 = types.ModuleType("fastf1")
+    fastf1.Cache = types.SimpleNamespace(enable_cache=lambda path: None)
+    sys.modules["fastf1"] = fastf1
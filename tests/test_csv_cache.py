@@ -0,0 +1,80 @@
+import os
+
+import pandas as pd
+
+from utils import csv_cache
+from utils.csv_cache import read_csv_cached
+from utils.performance_log import append_performance_log
+
+
+def test_read_csv_cached_returns_copies(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({"a": [1, 2]}).to_csv("data.csv", index=False)
+
+    df = read_csv_cached("data.csv")
+    df["a"] = 0
+
+    assert read_csv_cached("data.csv")["a"].tolist() == [1, 2]
+    assert read_csv_cached("data.csv", columns=["a"]).columns.tolist() == ["a"]
+
+
+def test_read_csv_cached_reloads_changed_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(csv_cache, "_LOADED", {})
+    pd.DataFrame({"a": [1]}).to_csv("data.csv", index=False)
+    assert read_csv_cached("data.csv")["a"].tolist() == [1]
+
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv("data.csv", index=False)
+    stat = os.stat("data.csv")
+    os.utime("data.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert read_csv_cached("data.csv")["a"].tolist() == [1, 2, 3]
+
+
+
+def test_read_csv_cached_shares_entry_for_relative_and_absolute_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(csv_cache, "_LOADED", {})
+    pd.DataFrame({"a": [1]}).to_csv("data.csv", index=False)
+
+    read_csv_cached("data.csv")
+    read_csv_cached(str(tmp_path / "data.csv"))
+
+    assert list(csv_cache._LOADED) == [str(tmp_path / "data.csv")]
+
+
+def test_read_csv_cached_detects_rewrite_with_same_mtime(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(csv_cache, "_LOADED", {})
+    pd.DataFrame({"a": [1]}).to_csv("data.csv", index=False)
+    read_csv_cached("data.csv")
+    stat = os.stat("data.csv")
+
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv("data.csv", index=False)
+    os.utime("data.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    monkeypatch.setattr(csv_cache, "_LOADED", {})  # neuer Prozess: nur der Pickle-Cache bleibt
+
+    assert read_csv_cached("data.csv")["a"].tolist() == [1, 2, 3]
+
+
+def test_append_performance_log_adds_rows_and_columns(tmp_path):
+    log_path = str(tmp_path / "log.csv")
+
+    assert append_performance_log({"model": "a", "accuracy": 0.5}, log_path) == 1
+    assert append_performance_log({"model": "b", "accuracy": 0.6}, log_path) == 2
+    assert append_performance_log({"model": "c", "rmse": 1.2}, log_path) == 3
+
+    log = pd.read_csv(log_path)
+    assert log["model"].tolist() == ["a", "b", "c"]
+    assert log["rmse"].isna().tolist() == [True, True, False]
+
+
+def test_append_performance_log_ids_count_rows_not_lines(tmp_path):
+    log_path = str(tmp_path / "log.csv")
+
+    assert append_performance_log({"model": "a", "notes": "zwei\nZeilen"}, log_path) == 1
+    assert append_performance_log({"model": "b", "notes": "x"}, log_path) == 2
+    assert append_performance_log({"model": "c", "rmse": 1.2}, log_path) == 3
+    assert append_performance_log({"model": "d", "notes": "y"}, log_path) == 4
+
+    assert pd.read_csv(log_path)["model"].tolist() == ["a", "b", "c", "d"]
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.feature_engineering import aggregate_lap_features
+
+
+@pytest.fixture
+def laps():
+    rng = np.random.default_rng(0)
+    n = 120
+    drivers = rng.choice(["VER", "HAM", "LEC", "ALO"], n)
+    lap_s = np.where(rng.random(n) < 0.1, np.nan, rng.normal(90, 2, n))
+    return pd.DataFrame({
+        "Driver": drivers,
+        "LapTime": pd.to_timedelta(lap_s, unit="s"),
+        "Stint": rng.integers(1, 4, n).astype(float),
+        "PitOutTime": pd.to_timedelta(np.where(rng.random(n) < 0.8, np.nan, 1.0), unit="s"),
+        "LapNumber": np.arange(1, n + 1, dtype=float),
+        "Team": rng.choice(["Red Bull", "Ferrari", "Mercedes"], n),
+    })
+
+
+def test_aggregate_matches_per_driver_loop(laps):
+    """Gleiche Werte wie die ursprüngliche Schleife über laps["Driver"].unique()."""
+    agg = aggregate_lap_features(laps)
+
+    assert list(agg.index) == list(laps["Driver"].unique())
+    for drv in laps["Driver"].unique():
+        d_laps = laps[laps["Driver"] == drv]
+        row = agg.loc[drv]
+        assert row["fastest_lap"] == pytest.approx(d_laps["LapTime"].min().total_seconds())
+        assert row["avg_lap"] == pytest.approx(d_laps["LapTime"].mean().total_seconds())
+        assert row["stints"] == d_laps["Stint"].nunique()
+        assert row["pitstops"] == d_laps["PitOutTime"].count()
+        assert row["laps_completed"] == d_laps["LapNumber"].max()
+        assert row["team"] == d_laps["Team"].iloc[0]
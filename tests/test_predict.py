@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from ml import predict
+
+
+def _laps():
+    return pd.DataFrame({
+        "Driver": ["VER", "VER", "HAM", "HAM", "XXX"],
+        "LapTime": pd.to_timedelta([90.0, 91.0, 92.0, 90.5, np.nan], unit="s"),
+        "Stint": [1.0, 2.0, 1.0, 1.0, 1.0],
+        "PitOutTime": pd.to_timedelta([np.nan, 1.0, np.nan, np.nan, np.nan], unit="s"),
+        "LapNumber": [1.0, 2.0, 1.0, 2.0, 1.0],
+        "Team": ["Red Bull", "Red Bull", "Ferrari", "Ferrari", "Haas"],
+    })
+
+
+def test_features_from_laps_reports_dropped_drivers(capsys):
+    X = predict.features_from_laps(_laps(), "Monaco")
+
+    assert list(X.index) == ["VER", "HAM"]
+    assert list(X.columns) == predict.FEATURES
+    assert (X.dtypes == np.float32).all()
+    assert "XXX" in capsys.readouterr().out
+
+
+def test_predicted_position_is_most_likely_class():
+    rng = np.random.default_rng(0)
+    X_train = pd.DataFrame(rng.normal(size=(200, len(predict.FEATURES))), columns=predict.FEATURES)
+    y_train = rng.integers(1, 6, 200)
+    model = HistGradientBoostingClassifier(max_iter=20, random_state=0).fit(X_train, y_train)
+    X = X_train.iloc[:20].set_axis([f"D{i}" for i in range(20)])
+
+    df, _ = predict._predict_position(model, X, 2025, "Monaco")
+
+    proba_cols = [f"p_place_{c}" for c in model.classes_]
+    expected = model.classes_[df[proba_cols].to_numpy().argmax(axis=1)]
+    assert df["predicted_position"].tolist() == expected.tolist()
+    assert df["predicted_position"].tolist() == model.predict(X).tolist()
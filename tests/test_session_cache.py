@@ -0,0 +1,60 @@
+import types
+
+import pandas as pd
+import pytest
+
+from utils import session_cache
+
+
+class FakeSession:
+    def __init__(self, date, laps):
+        self.date = date
+        self._laps = laps
+        self.weather_data = pd.DataFrame({"AirTemp": [20.0]})
+        self.results = pd.DataFrame({"Abbreviation": ["VER"]})
+
+    def load(self):
+        self.laps = types.SimpleNamespace(pick_quicklaps=lambda: self._laps)
+
+
+@pytest.fixture
+def fake_fastf1(tmp_path, monkeypatch):
+    """Zählt get_session-Aufrufe; jeder Aufruf liefert einen neuen Laps-Stand."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(session_cache, "_COMPLETE_LAPS", {})
+    calls = {"n": 0, "date": None}
+
+    def get_session(year, race, session_type):
+        calls["n"] += 1
+        laps = pd.DataFrame({"Driver": ["VER"] * calls["n"], "LapNumber": range(1, calls["n"] + 1)})
+        return FakeSession(calls["date"], laps)
+
+    monkeypatch.setattr(session_cache, "fastf1", types.SimpleNamespace(get_session=get_session))
+    return calls
+
+
+def test_running_session_is_reloaded(fake_fastf1):
+    fake_fastf1["date"] = pd.Timestamp.now(tz="UTC") - pd.Timedelta(hours=1)
+
+    first = session_cache.get_laps(2025, "Canada")
+    second = session_cache.get_laps(2025, "Canada")
+
+    assert fake_fastf1["n"] == 2
+    assert len(second) > len(first)
+    assert not (session_cache.os.path.exists(session_cache.PARSED_CACHE_DIR))
+
+
+def test_complete_session_is_cached(fake_fastf1):
+    fake_fastf1["date"] = pd.Timestamp("2025-06-15 18:00", tz="UTC")
+
+    laps, _, _ = session_cache.load_race(2025, "Canada")
+    session_cache.get_laps(2025, "Canada")
+    session_cache.get_laps(2025, "Canada")
+    cached, _, _ = session_cache.load_race(2025, "Canada")
+
+    assert fake_fastf1["n"] == 1
+    pd.testing.assert_frame_equal(cached, laps)
+
+
+def test_session_without_date_counts_as_incomplete():
+    assert not session_cache.session_complete(types.SimpleNamespace(date=pd.NaT))
@@ -0,0 +1,15 @@
+import types
+
+from ml import train_all
+
+
+def test_train_all_calls_main_of_selected_modules(monkeypatch):
+    called = []
+    monkeypatch.setattr(
+        train_all.importlib, "import_module",
+        lambda name: types.SimpleNamespace(main=lambda: called.append(name)),
+    )
+
+    train_all.main(["--models", "top10", "position"])
+
+    assert called == ["train_model_top10", "train_model"]
@@ -0,0 +1,50 @@
+import os
+import pandas as pd
+
+# Geparste CSV-Dateien: cache/parsed/csv/{pfad}.pkl
+CSV_CACHE_DIR = os.path.join("cache", "parsed", "csv")
+
+# Im selben Prozess bereits geladene Dateien: {absoluter pfad: (signatur, DataFrame)}
+_LOADED = {}
+
+
+def _signature(path: str):
+    """(mtime_ns, Größe) der CSV-Datei; ändert sich bei jedem Neuschreiben."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_csv_cached(path: str, columns=None) -> pd.DataFrame:
+    """
+    pd.read_csv mit Pickle-Cache unter cache/parsed/csv/.
+
+    Der Pickle behält die dtypes und lädt ohne CSV-Tokenizer; er speichert
+    die Signatur (mtime_ns, Größe) der CSV-Datei und wird neu erzeugt,
+    sobald diese nicht mehr passt. Innerhalb eines Prozesses (z.B.
+    ml/train_all.py) wird jede Datei nur einmal geladen, egal ob relativ
+    oder absolut angegeben; Aufrufer erhalten eine Kopie und dürfen sie
+    verändern.
+
+    Args:
+        path: Pfad zur CSV-Datei
+        columns: Optional nur diese Spalten zurückgeben
+    """
+    path = os.path.abspath(path)
+    signature = _signature(path)
+    loaded = _LOADED.get(path)
+    if loaded is not None and loaded[0] == signature:
+        df = loaded[1]
+    else:
+        name = path.replace(os.sep, "_").replace(":", "_")
+        cache_file = os.path.join(CSV_CACHE_DIR, name + ".pkl")
+
+        cached = pd.read_pickle(cache_file) if os.path.exists(cache_file) else None
+        if isinstance(cached, dict) and cached.get("signature") == signature:
+            df = cached["data"]
+        else:
+            df = pd.read_csv(path)
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            pd.to_pickle({"signature": signature, "data": df}, cache_file)
+        _LOADED[path] = (signature, df)
+
+    return df.copy() if columns is None else df[list(columns)].copy()
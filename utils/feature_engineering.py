@@ -36,12 +36,54 @@ TEAM_STRENGTH = {
     "AlphaTauri": 0.4,
 }
 
+# Abgeleitete Scores einmal beim Import vorberechnen statt pro Aufruf
+_TRACK_AFFINITY = {key: 1.0 / avg_pos for key, avg_pos in TRACK_RESULTS.items()}
+_MOMENTUM = {drv: 1.0 / (np.mean(history) + 1e-6) for drv, history in LAST_FINISHES.items()}
+_DEFAULT_TRACK_AFFINITY = 1.0 / 10.0
+_DEFAULT_MOMENTUM = 1.0 / (10.0 + 1e-6)
+
 def get_track_affinity(race: str, driver: str) -> float:
-    return 1.0 / TRACK_RESULTS.get((race, driver), 10.0)
+    return _TRACK_AFFINITY.get((race, driver), _DEFAULT_TRACK_AFFINITY)
 
 def get_team_strength(team: str) -> float:
     return TEAM_STRENGTH.get(team, 0.5)
 
 def estimate_momentum(driver: str) -> float:
-    history = LAST_FINISHES.get(driver, [10, 10, 10])
-    return 1.0 / (np.mean(history) + 1e-6)  # besser = höherer Score
+    return _MOMENTUM.get(driver, _DEFAULT_MOMENTUM)  # besser = höherer Score
+
+# Batch-Varianten: ganze Fahrer-/Team-Spalten auf einmal über reindex statt Einzelaufrufen
+_TRACK_AFFINITY_S = pd.Series(_TRACK_AFFINITY)
+_TEAM_STRENGTH_S = pd.Series(TEAM_STRENGTH)
+_MOMENTUM_S = pd.Series(_MOMENTUM)
+
+def track_affinity_batch(races, drivers) -> np.ndarray:
+    """Track-Affinity für viele Fahrer; `races` darf ein einzelner Rennname sein."""
+    drivers = np.asarray(drivers)
+    races = np.broadcast_to(np.asarray(races, dtype=object), drivers.shape)
+    keys = pd.MultiIndex.from_arrays([races, drivers])
+    return _TRACK_AFFINITY_S.reindex(keys).fillna(_DEFAULT_TRACK_AFFINITY).to_numpy()
+
+def team_strength_batch(teams) -> np.ndarray:
+    return _TEAM_STRENGTH_S.reindex(teams).fillna(0.5).to_numpy()
+
+def momentum_batch(drivers) -> np.ndarray:
+    return _MOMENTUM_S.reindex(drivers).fillna(_DEFAULT_MOMENTUM).to_numpy()
+
+def aggregate_lap_features(laps: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rundenbasierte Features pro Fahrer in einem groupby-Durchlauf.
+
+    Gemeinsame Basis der Vorhersage- und Trainingsdaten-Skripte. Fahrer
+    stehen in der Reihenfolge ihres ersten Auftretens (wie
+    laps["Driver"].unique()), team ist das Team der ersten Runde.
+    """
+    laps = laps.assign(LapTime_s=laps["LapTime"].dt.total_seconds())
+    agg = laps.groupby("Driver", sort=False).agg(
+        fastest_lap=("LapTime_s", "min"),
+        avg_lap=("LapTime_s", "mean"),
+        stints=("Stint", "nunique"),
+        pitstops=("PitOutTime", "count"),
+        laps_completed=("LapNumber", "max"),
+    )
+    agg["team"] = laps.drop_duplicates("Driver").set_index("Driver")["Team"]
+    return agg
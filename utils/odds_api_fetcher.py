@@ -1,10 +1,40 @@
 import os
+import json
+import time
+import hashlib
 import requests
 from dotenv import load_dotenv
 
 load_dotenv()
 API_KEY = os.getenv("ODDS_API_KEY")
 
+# Antworten kurz auf der Platte puffern: spart Latenz und API-Kontingent bei Wiederholungen
+ODDS_CACHE_DIR = os.path.join("cache", "parsed", "odds")
+ODDS_CACHE_TTL = 300  # Sekunden
+
+
+def _get_odds_json(url, params):
+    """GET mit Datei-Cache (TTL); nur erfolgreiche Antworten werden gespeichert."""
+    # Schlüssel aus URL und allen Parametern außer dem API-Key
+    key_params = sorted((k, str(v)) for k, v in params.items() if k != "apiKey")
+    key = hashlib.sha1(json.dumps([url, key_params]).encode()).hexdigest()
+    cache_file = os.path.join(ODDS_CACHE_DIR, f"{key}.json")
+    if os.path.exists(cache_file) and time.time() - os.path.getmtime(cache_file) < ODDS_CACHE_TTL:
+        with open(cache_file) as f:
+            return json.load(f)
+
+    response = requests.get(url, params=params, timeout=10)
+    if response.status_code != 200:
+        print("Error fetching odds:", response.status_code, response.text)
+        return None
+
+    data = response.json()
+    os.makedirs(ODDS_CACHE_DIR, exist_ok=True)
+    with open(cache_file, "w") as f:
+        json.dump(data, f)
+    return data
+
+
 def fetch_odds_for_next_f1_race(region="uk", market="winner"):
     url = f"https://api.the-odds-api.com/v4/sports/formula_one/odds"
     params = {
@@ -14,28 +44,22 @@ def fetch_odds_for_next_f1_race(region="uk", market="winner"):
         "oddsFormat": "decimal",
     }
 
-    response = requests.get(url, params=params)
-
-    if response.status_code != 200:
-        print("Error fetching odds:", response.status_code, response.text)
+    data = _get_odds_json(url, params)
+    if data is None:
         return {}
 
-    data = response.json()
     if not data:
         print("No odds data returned.")
         return {}
 
-    # Nehmen wir einfach das erste Event
-    event = data[0]
-    outcomes = {}
-
-    for bookmaker in event.get("bookmakers", []):
-        for market in bookmaker.get("markets", []):
-            for outcome in market.get("outcomes", []):
-                driver = outcome.get("name")
-                price = outcome.get("price")
-                if driver and price:
-                    outcomes[driver] = price
-        break  # Nur einen Buchmacher verwenden
+    # Nehmen wir einfach das erste Event und davon nur den ersten Buchmacher
+    bookmakers = data[0].get("bookmakers", [])
+    if not bookmakers:
+        return {}
 
-    return outcomes
+    return {
+        outcome["name"]: outcome["price"]
+        for market in bookmakers[0].get("markets", [])
+        for outcome in market.get("outcomes", [])
+        if outcome.get("name") and outcome.get("price")
+    }
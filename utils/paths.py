@@ -0,0 +1,12 @@
+import os
+
+# Bereits angelegte Verzeichnisse: wiederholte Aufrufe sparen stat+mkdir
+_ENSURED_DIRS = set()
+
+
+def ensure_dir(path: str):
+    """os.makedirs(path, exist_ok=True), höchstens einmal pro Pfad und Prozess"""
+    if path in _ENSURED_DIRS:
+        return
+    os.makedirs(path, exist_ok=True)
+    _ENSURED_DIRS.add(path)
@@ -0,0 +1,35 @@
+import os
+import pandas as pd
+
+# Gemeinsames Log aller Trainingsskripte (Spalten = Vereinigung aller Einträge)
+PERFORMANCE_LOG_PATH = os.path.join("data", "processed", "model_performance_log.csv")
+
+
+def append_performance_log(entry: dict, log_path: str = PERFORMANCE_LOG_PATH) -> int:
+    """
+    Hängt einen Eintrag an das Modell-Performance-Log an.
+
+    Sind alle Schlüssel bereits Spalten des Logs, wird nur die neue Zeile
+    (in Kopfzeilen-Reihenfolge) angehängt; nur bei neuen Spalten wird das
+    Log einmal komplett neu geschrieben.
+
+    Returns:
+        Laufende Nummer des Eintrags (1-basiert)
+    """
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    row = pd.DataFrame([entry])
+
+    if not os.path.exists(log_path):
+        row.to_csv(log_path, index=False)
+        return 1
+
+    header = pd.read_csv(log_path, nrows=0).columns
+    if set(entry) <= set(header):
+        # Zeilen per CSV-Parser zählen: Felder dürfen Zeilenumbrüche enthalten
+        log_id = len(pd.read_csv(log_path, usecols=[0])) + 1
+        row.reindex(columns=header).to_csv(log_path, mode="a", header=False, index=False)
+        return log_id
+
+    old = pd.read_csv(log_path)
+    pd.concat([old, row], ignore_index=True).to_csv(log_path, index=False)
+    return len(old) + 1
@@ -2,13 +2,28 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import os
+import csv
 from typing import Optional, Dict, List, Tuple
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.backends.backend_pdf import PdfPages
 import warnings
 warnings.filterwarnings('ignore')
 
+from utils.csv_cache import read_csv_cached
+from utils.paths import ensure_dir
+
+# Festes Format der Wahrscheinlichkeits-CSV: keine Typ-Inferenz beim Einlesen nötig
+PROBABILITY_DTYPES = {f'P{i}': np.float64 for i in range(1, 21)}
+PROBABILITY_DTYPES.update({'driver': str, 'Driver': str})
+
+
+def _timestamp_fields() -> Dict:
+    """Ein Zeitstempel für Datei-Inhalt und Dateiname"""
+    now = datetime.now()
+    return {
+        'timestamp': now,
+        'timestamp_str': now.strftime('%d.%m.%Y %H:%M'),
+        'timestamp_fname': now.strftime('%Y%m%d_%H%M')
+    }
+
 class F1PredictionExporter:
     """
     Klasse zum Export von F1-Vorhersagen als formatierte PDF oder CSV.
@@ -37,6 +52,8 @@ class F1PredictionExporter:
             'Yuki Tsunoda': '#2B4562',
             'Daniel Ricciardo': '#2B4562'
         }
+        # RGBA-Farben, beim ersten PDF-Export berechnet (siehe export_to_pdf)
+        self._driver_rgba = None
     
     def load_probabilities(self, csv_path: str) -> pd.DataFrame:
         """
@@ -49,7 +66,9 @@ class F1PredictionExporter:
             DataFrame mit Wahrscheinlichkeiten
         """
         try:
-            df = pd.read_csv(csv_path)
+            # Unveränderte CSV kommt aus dem Pickle-Cache (eigene Kopie pro Aufruf)
+            df = read_csv_cached(csv_path)
+            df = df.astype({col: dtype for col, dtype in PROBABILITY_DTYPES.items() if col in df.columns})
             print(f"📊 Wahrscheinlichkeiten geladen: {df.shape}")
             return df
         except FileNotFoundError:
@@ -78,59 +97,54 @@ class F1PredictionExporter:
         else:
             drivers = [f"Driver {i+1}" for i in range(len(df))]
         
-        # Extrahiere Wahrscheinlichkeits-Spalten (P1, P2, etc.)
-        prob_cols = [col for col in df.columns if col.startswith('P') and col[1:].isdigit()]
-        prob_cols = sorted(prob_cols, key=lambda x: int(x[1:]))
+        # Extrahiere Wahrscheinlichkeits-Spalten (P1, P2, etc.), Positionsnummer nur einmal parsen
+        prob_pairs = sorted((int(col[1:]), col) for col in df.columns if col.startswith('P') and col[1:].isdigit())
+        prob_cols = [col for _, col in prob_pairs]
+        position_numbers = np.array([pos for pos, _ in prob_pairs], dtype=np.int32)
         
         if not prob_cols:
-            # Fallback: alle numerischen Spalten außer driver
+            # Fallback: alle numerischen Spalten außer driver, Position = Spaltenreihenfolge
             numeric_cols = df.select_dtypes(include=[np.number]).columns
             prob_cols = [col for col in numeric_cols if col not in ['driver', 'Driver']]
+            position_numbers = np.arange(1, len(prob_cols) + 1, dtype=np.int32)
+        
+        # Alle Fahrer auf einmal: eine Matrix (Fahrer x Positionen) statt df.iloc pro Zeile
+        probs = df[prob_cols].to_numpy(dtype=np.float64)
+        n_drivers = len(probs)
+        
+        def prob_col(i):
+            return probs[:, i] if probs.shape[1] > i else np.zeros(n_drivers)
+        
+        def as_percent(values):
+            return np.char.mod('%.1f%%', values * 100)
+        
+        # Höchste Wahrscheinlichkeit und Position
+        max_prob_idx = probs.argmax(axis=1)
+        max_prob = probs[np.arange(n_drivers), max_prob_idx]
+        # Ein Label pro Spalte (max. ~20), danach nur noch Indexzugriff pro Fahrer
+        position_labels = np.array([f"P{pos}" for pos in position_numbers])
+        
+        # Rohwerte (0-1) für Diagramme, damit die formatierten Strings nicht zurückgeparst werden
+        probs_numeric = {
+            'P1': prob_col(0),
+            'P2': prob_col(1),
+            'P3': prob_col(2),
+            'Top 5': probs[:, :5].sum(axis=1),
+            'Top 10': probs[:, :10].sum(axis=1)
+        }
         
         # Erstelle Export-DataFrame
         export_data = {
             'Fahrer': drivers,
-            'Höchste Wahrscheinlichkeit': [],
-            'Wahrscheinlichste Position': [],
-            'P1 Chance': [],
-            'P2 Chance': [],
-            'P3 Chance': [],
-            'Top 5 Chance': [],
-            'Top 10 Chance': []
+            'Höchste Wahrscheinlichkeit': as_percent(max_prob),
+            'Wahrscheinlichste Position': position_labels[max_prob_idx],
+            **{f'{key} Chance': as_percent(values) for key, values in probs_numeric.items()}
         }
         
-        for i, driver in enumerate(drivers):
-            # Wahrscheinlichkeiten für diesen Fahrer
-            probs = df.iloc[i][prob_cols].values
-            
-            # Höchste Wahrscheinlichkeit und Position
-            max_prob_idx = np.argmax(probs)
-            max_prob = probs[max_prob_idx]
-            most_likely_pos = int(prob_cols[max_prob_idx][1:])
-            
-            export_data['Höchste Wahrscheinlichkeit'].append(f"{max_prob:.1%}")
-            export_data['Wahrscheinlichste Position'].append(f"P{most_likely_pos}")
-            
-            # Spezifische Positionen
-            p1_prob = probs[0] if len(probs) > 0 else 0
-            p2_prob = probs[1] if len(probs) > 1 else 0
-            p3_prob = probs[2] if len(probs) > 2 else 0
-            
-            export_data['P1 Chance'].append(f"{p1_prob:.1%}")
-            export_data['P2 Chance'].append(f"{p2_prob:.1%}")
-            export_data['P3 Chance'].append(f"{p3_prob:.1%}")
-            
-            # Top 5 und Top 10 Chancen
-            top5_prob = sum(probs[:5]) if len(probs) >= 5 else sum(probs)
-            top10_prob = sum(probs[:10]) if len(probs) >= 10 else sum(probs)
-            
-            export_data['Top 5 Chance'].append(f"{top5_prob:.1%}")
-            export_data['Top 10 Chance'].append(f"{top10_prob:.1%}")
-        
         # Bestimme beste Wetten (höchste P1-P3 Wahrscheinlichkeiten)
-        p1_probs = df[prob_cols[0]].values if len(prob_cols) > 0 else np.zeros(len(drivers))
-        p2_probs = df[prob_cols[1]].values if len(prob_cols) > 1 else np.zeros(len(drivers))
-        p3_probs = df[prob_cols[2]].values if len(prob_cols) > 2 else np.zeros(len(drivers))
+        p1_probs = probs_numeric['P1']
+        p2_probs = probs_numeric['P2']
+        p3_probs = probs_numeric['P3']
         
         best_bets = {
             'P1': {
@@ -149,8 +163,9 @@ class F1PredictionExporter:
         
         return {
             'export_df': pd.DataFrame(export_data),
+            'probs_numeric': probs_numeric,
             'race_name': race_name or "F1 Grand Prix",
-            'timestamp': datetime.now(),
+            **_timestamp_fields(),
             'best_bets': best_bets,
             'total_drivers': len(drivers)
         }
@@ -166,16 +181,16 @@ class F1PredictionExporter:
         Returns:
             Pfad zur erstellten CSV-Datei
         """
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        ensure_dir(os.path.dirname(output_path))
         
         # Haupttabelle
         df = data['export_df']
         
-        # Füge Metadaten hinzu
-        with open(output_path, 'w', encoding='utf-8') as f:
+        # Metadaten und Tabelle über einen gepufferten Datei-Handle schreiben
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
             f.write(f"# F1 VORHERSAGE EXPORT\n")
             f.write(f"# Rennen: {data['race_name']}\n")
-            f.write(f"# Erstellt: {data['timestamp'].strftime('%d.%m.%Y %H:%M')}\n")
+            f.write(f"# Erstellt: {data['timestamp_str']}\n")
             f.write(f"# Anzahl Fahrer: {data['total_drivers']}\n")
             f.write(f"#\n")
             f.write(f"# BESTE WETTEN:\n")
@@ -183,9 +198,11 @@ class F1PredictionExporter:
                 f.write(f"# {pos}: {bet_info['driver']} ({bet_info['probability']})\n")
             f.write(f"#\n")
             f.write(f"\n")
-        
-        # Füge DataFrame hinzu
-        df.to_csv(output_path, mode='a', index=False, encoding='utf-8')
+            
+            # Füge Tabelle hinzu: alle Zellen sind bereits Strings -> csv.writer statt df.to_csv
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(df.columns)
+            writer.writerows(zip(*(df[col].tolist() for col in df.columns)))
         
         print(f"📄 CSV exportiert: {output_path}")
         return output_path
@@ -201,18 +218,30 @@ class F1PredictionExporter:
         Returns:
             Pfad zur erstellten PDF-Datei
         """
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        # matplotlib erst hier laden: CSV-Exporte brauchen weder Plot-Bibliothek noch Fonts
+        import matplotlib.colors as mcolors
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_pdf import PdfPages
+        
+        if self._driver_rgba is None:
+            # Einmal nach RGBA umgerechnet, damit matplotlib die Hex-Strings nicht pro Balken parst
+            self._driver_rgba = {driver: mcolors.to_rgba(color) for driver, color in self.driver_colors.items()}
+        
+        ensure_dir(os.path.dirname(output_path))
         
+        # Eine Figure für beide Seiten: zwischen den Seiten nur leeren statt neu anlegen.
+        # Ohne pyplot: kein GUI-Backend, keine globale Figure-Verwaltung
+        fig = Figure(figsize=(16, 12))
         with PdfPages(output_path) as pdf:
             # Seite 1: Übersicht und beste Wetten
-            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+            (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
             fig.suptitle(f"F1 Vorhersage: {data['race_name']}", fontsize=20, fontweight='bold')
             
             # Titel-Info
             ax1.text(0.5, 0.8, f"Rennen: {data['race_name']}", 
                     ha='center', va='center', fontsize=16, fontweight='bold',
                     transform=ax1.transAxes)
-            ax1.text(0.5, 0.6, f"Erstellt: {data['timestamp'].strftime('%d.%m.%Y %H:%M')}", 
+            ax1.text(0.5, 0.6, f"Erstellt: {data['timestamp_str']}", 
                     ha='center', va='center', fontsize=12,
                     transform=ax1.transAxes)
             ax1.text(0.5, 0.4, f"Anzahl Fahrer: {data['total_drivers']}", 
@@ -237,45 +266,43 @@ class F1PredictionExporter:
             
             # P1 Wahrscheinlichkeiten (Top 10)
             df = data['export_df']
-            p1_data = df[['Fahrer', 'P1 Chance']].copy()
-            p1_data['P1_numeric'] = p1_data['P1 Chance'].str.rstrip('%').astype(float)
-            p1_top10 = p1_data.nlargest(10, 'P1_numeric')
+            probs_numeric = data['probs_numeric']
+            p1 = probs_numeric['P1']
+            # Top-k per argpartition (O(N)), danach nur die k Werte absteigend sortieren
+            k = min(10, p1.size)
+            if k > 0:
+                top_idx = np.sort(np.argpartition(-p1, k - 1)[:k])
+                top_idx = top_idx[np.argsort(-p1[top_idx], kind='stable')]
+            else:
+                top_idx = np.empty(0, dtype=np.intp)  # keine Fahrer: leeres Diagramm statt ValueError
+            top_names = df['Fahrer'].to_numpy()[top_idx]
+            top_values = p1[top_idx] * 100
             
-            bars = ax3.barh(range(len(p1_top10)), p1_top10['P1_numeric'])
-            ax3.set_yticks(range(len(p1_top10)))
-            ax3.set_yticklabels(p1_top10['Fahrer'], fontsize=10)
+            # Farbkodierung der Balken (Teamfarbe, sonst Standardfarbe des Zyklus)
+            colors = [self._driver_rgba.get(driver, mcolors.to_rgba(f'C{i}'))
+                      for i, driver in enumerate(top_names)]
+            ax3.barh(range(k), top_values, color=colors)
+            ax3.set_yticks(range(k))
+            ax3.set_yticklabels(top_names, fontsize=10)
             ax3.set_xlabel('P1 Wahrscheinlichkeit (%)')
             ax3.set_title('Top 10 P1 Chancen', fontweight='bold')
             ax3.grid(True, alpha=0.3)
             
-            # Farbkodierung der Balken
-            for i, (bar, driver) in enumerate(zip(bars, p1_top10['Fahrer'])):
-                if driver in self.driver_colors:
-                    bar.set_color(self.driver_colors[driver])
-                else:
-                    bar.set_color(f'C{i}')
-            
             # Wahrscheinlichkeitsverteilung
             positions = ['P1', 'P2', 'P3', 'Top 5', 'Top 10']
-            avg_probs = []
-            for pos in positions:
-                if pos + ' Chance' in df.columns:
-                    prob_col = df[pos + ' Chance'].str.rstrip('%').astype(float)
-                    avg_probs.append(prob_col.mean())
-                else:
-                    avg_probs.append(0)
+            avg_probs = [probs_numeric[pos].mean() * 100 for pos in positions]
             
             ax4.bar(positions, avg_probs, color=['gold', 'silver', '#CD7F32', 'lightblue', 'lightgreen'])
             ax4.set_ylabel('Durchschnittliche Wahrscheinlichkeit (%)')
             ax4.set_title('Durchschnittliche Chancen', fontweight='bold')
             ax4.grid(True, alpha=0.3)
             
-            plt.tight_layout()
+            fig.tight_layout()
             pdf.savefig(fig, bbox_inches='tight')
-            plt.close()
+            fig.clear()
             
             # Seite 2: Detaillierte Tabelle
-            fig, ax = plt.subplots(figsize=(16, 12))
+            ax = fig.add_subplot()
             fig.suptitle(f"Detaillierte Wahrscheinlichkeiten - {data['race_name']}", 
                         fontsize=16, fontweight='bold')
             
@@ -289,22 +316,18 @@ class F1PredictionExporter:
             table.set_fontsize(8)
             table.scale(1, 2)
             
-            # Header-Styling
-            for i in range(len(df.columns)):
-                table[(0, i)].set_facecolor('#4CAF50')
-                table[(0, i)].set_text_props(weight='bold', color='white')
-            
-            # Zeilen-Styling (abwechselnde Farben)
-            for i in range(1, len(df) + 1):
-                for j in range(len(df.columns)):
-                    if i % 2 == 0:
-                        table[(i, j)].set_facecolor('#f0f0f0')
+            # Header- und Zeilen-Styling (abwechselnde Farben) in einem Durchlauf über alle Zellen
+            for (row, _), cell in table.get_celld().items():
+                if row == 0:
+                    cell.set_facecolor('#4CAF50')
+                    cell.set_text_props(weight='bold', color='white')
+                elif row % 2 == 0:
+                    cell.set_facecolor('#f0f0f0')
             
             ax.axis('off')
             
-            plt.tight_layout()
+            fig.tight_layout()
             pdf.savefig(fig, bbox_inches='tight')
-            plt.close()
         
         print(f"📄 PDF exportiert: {output_path}")
         return output_path
@@ -326,17 +349,15 @@ class F1PredictionExporter:
         """
         print(f"📦 Starte Vorhersage-Export...")
         
-        # Lade Daten
+        # Lade und bereite Daten vor
         df = self.load_probabilities(csv_path)
-        
-        # Bereite Export-Daten vor
         data = self.prepare_export_data(df, race_name)
         
         # Erstelle Ausgabeverzeichnis
-        os.makedirs(output_dir, exist_ok=True)
+        ensure_dir(output_dir)
         
         # Dateinamen
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        timestamp = data['timestamp_fname']
         race_safe = (race_name or "F1_Race").replace(" ", "_").replace("/", "_")
         
         exported_files = {}
@@ -372,37 +393,31 @@ def create_sample_predictions(output_path: str = "data/live/sample_predictions.c
     
     np.random.seed(42)
     
-    # Erstelle realistische Wahrscheinlichkeitsverteilungen
-    data = {'driver': drivers}
+    # Erstelle realistische Wahrscheinlichkeitsverteilungen (Positionen x Fahrer)
+    pos = np.arange(1, 21)[:, None]
+    i = np.arange(len(drivers))[None, :]
     
-    for pos in range(1, 21):
-        # Höhere Wahrscheinlichkeiten für bessere Fahrer in vorderen Positionen
-        probs = []
-        for i, driver in enumerate(drivers):
-            if pos <= 3:  # Podium
-                base_prob = max(0.01, 0.3 - i * 0.02)  # Bessere Fahrer haben höhere Chancen
-            elif pos <= 10:  # Punkte
-                base_prob = max(0.01, 0.15 - abs(pos - 5 - i) * 0.01)
-            else:  # Hinteres Feld
-                base_prob = max(0.01, 0.1 - abs(pos - 15 - i) * 0.005)
-            
-            # Füge Zufälligkeit hinzu
-            prob = base_prob + np.random.normal(0, 0.02)
-            prob = max(0.001, min(0.5, prob))  # Begrenze Wahrscheinlichkeiten
-            probs.append(prob)
-        
-        data[f'P{pos}'] = probs
+    # Höhere Wahrscheinlichkeiten für bessere Fahrer in vorderen Positionen
+    base_prob = np.where(
+        pos <= 3, np.maximum(0.01, 0.3 - i * 0.02),  # Podium: bessere Fahrer haben höhere Chancen
+        np.where(
+            pos <= 10, np.maximum(0.01, 0.15 - np.abs(pos - 5 - i) * 0.01),  # Punkte
+            np.maximum(0.01, 0.1 - np.abs(pos - 15 - i) * 0.005)  # Hinteres Feld
+        )
+    )
+    
+    # Füge Zufälligkeit hinzu (gleiche Zufallsfolge wie Position für Position gezogen)
+    probs = base_prob + np.random.normal(0, 0.02, base_prob.shape)
+    probs = np.clip(probs, 0.001, 0.5).T  # Begrenze Wahrscheinlichkeiten
     
     # Normalisiere Wahrscheinlichkeiten pro Fahrer
-    df = pd.DataFrame(data)
-    prob_cols = [f'P{i}' for i in range(1, 21)]
+    probs = probs / probs.sum(axis=1, keepdims=True)
     
-    for i in range(len(drivers)):
-        row_sum = df.loc[i, prob_cols].sum()
-        df.loc[i, prob_cols] = df.loc[i, prob_cols] / row_sum
+    df = pd.DataFrame(probs, columns=[f'P{p}' for p in range(1, 21)])
+    df.insert(0, 'driver', drivers)
     
     # Speichere
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    ensure_dir(os.path.dirname(output_path))
     df.to_csv(output_path, index=False)
     
     print(f"📊 Beispiel-Vorhersagen erstellt: {output_path}")
@@ -0,0 +1,91 @@
+import os
+import pandas as pd
+import fastf1
+
+# Bereits geparste Sessions: cache/parsed/sessions/{year}/{race}/{session_type}/*.pkl
+PARSED_CACHE_DIR = os.path.join("cache", "parsed", "sessions")
+
+# Erst so lange nach Session-Start gelten die FastF1-Daten als final und werden gecacht.
+# Großzügig gewählt: deckt Renndauer, Unterbrechungen und lokale statt UTC-Startzeiten ab.
+SESSION_SETTLE_TIME = pd.Timedelta(hours=12)
+
+
+def session_complete(session) -> bool:
+    """True, wenn die Session lange genug vorbei ist, dass keine Daten mehr nachkommen."""
+    start = getattr(session, "date", None)
+    if start is None or pd.isna(start):
+        return False
+    start = pd.Timestamp(start)
+    if start.tzinfo is None:
+        start = start.tz_localize("UTC")
+    return pd.Timestamp.now(tz="UTC") - start > SESSION_SETTLE_TIME
+
+
+def _cache_files(year: int, race: str, session_type: str) -> dict:
+    path = os.path.join(PARSED_CACHE_DIR, str(year), race, session_type)
+    return {name: os.path.join(path, f"{name}.pkl") for name in ("laps", "weather", "results")}
+
+
+def _load_race(year: int, race: str, session_type: str):
+    """load_race() plus Flag, ob die Daten aus einer abgeschlossenen Session stammen."""
+    files = _cache_files(year, race, session_type)
+
+    if all(os.path.exists(f) for f in files.values()):
+        return tuple(pd.read_pickle(f) for f in files.values()), True
+
+    session = fastf1.get_session(year, race, session_type)
+    session.load()
+
+    # FastF1-Unterklassen hängen an der Session -> als einfache DataFrames speichern
+    frames = {
+        "laps": pd.DataFrame(session.laps.pick_quicklaps()),
+        "weather": pd.DataFrame(session.weather_data),
+        "results": pd.DataFrame(session.results),
+    }
+
+    # Laufende oder gerade beendete Sessions nicht cachen: sonst bliebe ein unvollständiger
+    # Stand für immer liegen
+    complete = session_complete(session)
+    if complete:
+        os.makedirs(os.path.dirname(files["laps"]), exist_ok=True)
+        for name, df in frames.items():
+            df.to_pickle(files[name])
+
+    return (frames["laps"], frames["weather"], frames["results"]), complete
+
+
+def load_race(year: int, race: str, session_type: str = "R"):
+    """
+    Lädt Quick-Laps, Wetter- und Ergebnisdaten einer Session.
+
+    Abgeschlossene Sessions (siehe SESSION_SETTLE_TIME) werden nach dem ersten
+    Laden als Pickle abgelegt; spätere Aufrufe lesen nur noch diese Dateien und
+    überspringen session.load() komplett. Laufende Sessions werden jedes Mal
+    frisch über FastF1 geladen.
+
+    Returns:
+        Tuple (laps, weather, results) als einfache DataFrames
+    """
+    return _load_race(year, race, session_type)[0]
+
+
+# Laps abgeschlossener Sessions je Prozess; laufende Sessions landen hier nie
+_COMPLETE_LAPS = {}
+
+
+def get_laps(year: int, race: str, session_type: str = "R") -> pd.DataFrame:
+    """
+    Quick-Laps einer Session; abgeschlossene Sessions im selben Prozess nur einmal geladen.
+
+    Die Vorhersage-Skripte teilen sich so den Pickle-Cache von load_race().
+    Laufende Sessions (Live-Vorhersage) werden bei jedem Aufruf neu geladen.
+    Das Ergebnis wird geteilt – nicht in-place verändern (z.B. .assign() nutzen).
+    """
+    key = (year, race, session_type)
+    if key in _COMPLETE_LAPS:
+        return _COMPLETE_LAPS[key]
+
+    (laps, _, _), complete = _load_race(year, race, session_type)
+    if complete:
+        _COMPLETE_LAPS[key] = laps
+    return laps